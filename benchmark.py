@@ -0,0 +1,91 @@
+"""Offline benchmark of the report pipeline on synthetic crc-test data.
+
+    python3 benchmark.py --docs 1000 10000 100000 [--charts] [--tracemalloc]
+
+Each scale generates synthetic hits, serves them through ingest.ReplayClient
+and times every pipeline stage in a scratch working directory, so no
+OpenSearch credentials are needed and result/ is left untouched.
+"""
+import argparse
+import json
+import os
+import tempfile
+import tracemalloc
+
+# the benchmark measures a cold run, without the incremental cache
+os.environ["CACHE_FOLDER"] = ""
+os.environ.setdefault("REGRESSION_BACKEND", "native")
+
+import performance_analyze as pa
+from src import ingest
+from src import instrument
+from src import synthetic
+
+REPO = os.path.dirname(os.path.abspath(__file__))
+
+
+def prepare_workdir():
+    workdir = tempfile.mkdtemp(prefix="crc-benchmark-")
+    for name in ["template", *(f for f in os.listdir(REPO) if f.startswith("otava-"))]:
+        os.symlink(os.path.join(REPO, name), os.path.join(workdir, name))
+    os.makedirs(os.path.join(workdir, pa.RESULT_FOLDER))
+    return workdir
+
+
+def run_stage(name, func, traced, **tags):
+    if traced:
+        tracemalloc.reset_peak()
+    with instrument.stage(name, **tags) as record:
+        result = func()
+    if traced:
+        record["traced_peak_mib"] = round(tracemalloc.get_traced_memory()[1] / 2**20, 1)
+    return result
+
+
+def run_pipeline(docs, seed, charts, traced):
+    client = ingest.ReplayClient(list(synthetic.generate_hits(docs, seed)))
+    time_platform, memory_platform, Platform_DATA = run_stage(
+        "connect_opensearch", lambda: pa.connect_opensearch(client), traced, docs=docs)
+    run_stage("get_cpu_data", lambda: [pa.get_cpu_data(i, Platform_DATA) for i in ingest.CPU_ITEMS], traced, docs=docs)
+    run_stage("summarize_by_bundle", lambda: pa.summarize_by_bundle(Platform_DATA), traced, docs=docs)
+    run_stage("export_time_csv", lambda: pa.export_time_csv(Platform_DATA), traced, docs=docs)
+    run_stage("export_memory_csv", lambda: pa.export_memory_csv(Platform_DATA), traced, docs=docs)
+    cpuData = run_stage("export_cpu_csv", lambda: pa.export_cpu_csv(Platform_DATA), traced, docs=docs)
+    if charts:
+        run_stage("draw_all", lambda: pa.draw_all(Platform_DATA), traced, docs=docs)
+    regression = run_stage("get_regression_result", pa.get_regression_result, traced, docs=docs)
+    run_stage("generate_html_report",
+              lambda: pa.generate_html_report(time_platform, memory_platform, Platform_DATA, regression, cpuData),
+              traced, docs=docs)
+    pa.EXPORTED_FRAMES.clear()
+    pa.BUNDLE_SUMMARY.clear()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--charts", action="store_true", help="include chart rendering")
+    parser.add_argument("--tracemalloc", action="store_true", help="record the Python heap peak of each stage")
+    parser.add_argument("--output", default="benchmark.json", help="where to write the stage records")
+    args = parser.parse_args()
+    output = os.path.abspath(args.output)
+
+    if args.tracemalloc:
+        tracemalloc.start()
+    os.chdir(prepare_workdir())
+    for docs in args.docs:
+        run_pipeline(docs, args.seed, args.charts, args.tracemalloc)
+
+    top_level = [r for r in instrument.RECORDS if "parent" not in r]
+    print(f"\n{'docs':>8} {'stage':<24} {'wall s':>9} {'cpu s':>9} {'rss MiB':>9} {'heap MiB':>9}")
+    for r in top_level:
+        print(f"{r['docs']:>8} {r['stage']:<24} {r['wall_seconds']:>9.3f} {r['cpu_seconds']:>9.3f}"
+              f" {r['peak_rss_mib']:>9.1f} {r.get('traced_peak_mib', ''):>9}")
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(instrument.RECORDS, f, indent=1)
+    print(f"\n✅ Benchmark records saved: {output}")
+
+
+if __name__ == "__main__":
+    main()
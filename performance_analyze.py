@@ -1,79 +1,172 @@
 from opensearchpy import OpenSearch
 import pandas as pd
+import matplotlib
+matplotlib.use("Agg")
 import matplotlib.pyplot as plt
-from jinja2 import Environment, FileSystemLoader
 from pathlib import Path
 import os
-import shutil
+import asyncio
+import json
 import subprocess
 from src import otava
-import gc
+from src import ingest
+from src import cache
+from src import aggregate
+from src import analysis
+from src import charts
+from src import downsample
+from src import export
+from src import instrument
+from src import report
+from src import series
+from src import pushdown
+from src import window
+from src import memo
+from src import async_ingest
+from src import changepoint
+from src import scheduler
+from src import manifest
 
 OPENSEARCH_HOST = os.environ.get("OPENSEARCH_HOST")  
 USERNAME = os.environ.get("USERNAME")
 PASSWORD = os.environ.get("PASSWORD")
+OPENSEARCH_REPLAY = os.environ.get("OPENSEARCH_REPLAY")
 RESULT_FOLDER = "result"
-
-def connect_opensearch():
-    # --- Create client ---
-    client = OpenSearch(
+TIME_METRICS = ingest.TIME_METRICS
+MEMORY_METRICS = ingest.MEMORY_METRICS
+# "otava" shells out to `otava analyze`, "native" runs src/changepoint.py on the exported frames
+REGRESSION_BACKEND = os.environ.get("REGRESSION_BACKEND", "otava")
+EXPORTED_FRAMES = {}
+# "async" fetches per-platform time slices concurrently with the asyncio client, "scroll" with one blocking scroll
+INGEST_MODE = os.environ.get("INGEST_MODE", "scroll")
+# "opensearch" computes the platform/bundle summary tables with aggregations on the server,
+# "pandas" from the fetched rows, which are still needed for the exports, charts and regression
+SUMMARY_MODE = os.environ.get("SUMMARY_MODE", "pandas")
+BUNDLE_SUMMARY = {}
+# the per-platform CSVs are a compatibility view of the Parquet dataset; otava itself still reads them
+EXPORT_CSV = os.environ.get("EXPORT_CSV", "1") == "1" or REGRESSION_BACKEND == "otava"
+# "cprofile" or "pyinstrument" dumps a profile of the whole run next to the report
+PROFILE = os.environ.get("PROFILE")
+# the report draws its charts in the browser; RENDER_PNG=1 also renders the static matplotlib images
+RENDER_PNG = os.environ.get("RENDER_PNG", "0") == "1"
+# when set, the pipeline's own stage timings are indexed into this OpenSearch index
+PIPELINE_METRICS_INDEX = os.environ.get("PIPELINE_METRICS_INDEX")
+
+def create_client():
+    if OPENSEARCH_REPLAY:
+        return ingest.ReplayClient(OPENSEARCH_REPLAY)
+    return OpenSearch(
         OPENSEARCH_HOST,
         http_auth=(USERNAME, PASSWORD),
         use_ssl=True,
         verify_certs=False,     # set False if using a self-signed certificate
         ssl_show_warn=False    # optional: hides SSL warnings if verify_certs=False
     )
-    if client.ping():
-        print("✅ Successfully connected to OpenSearch!")
+
+def create_async_client():
+    if OPENSEARCH_REPLAY:
+        return async_ingest.AsyncReplayClient(ingest.ReplayClient(OPENSEARCH_REPLAY))
+    try:
+        from opensearchpy import AsyncOpenSearch
+    except ImportError:
+        print("⚠️ opensearch-py[async] is not installed, falling back to the blocking scroll.")
+        return None
+    return AsyncOpenSearch(
+        OPENSEARCH_HOST,
+        http_auth=(USERNAME, PASSWORD),
+        use_ssl=True,
+        verify_certs=False,
+        ssl_show_warn=False,
+        http_compress=True,     # gzip-compressed responses
+        maxsize=async_ingest.CONCURRENCY,   # pooled connections, one per concurrent slice
+        max_retries=0,          # async_ingest retries with backoff itself
+    )
+
+def fetch_records(client, since):
+    if INGEST_MODE == "async":
+        if isinstance(client, ingest.ReplayClient):
+            async_client = async_ingest.AsyncReplayClient(client)
+        else:
+            async_client = create_async_client()
+        if async_client is not None:
+            return asyncio.run(async_ingest.load_platform_data(async_client, since=since))
+    return ingest.load_platform_data(client or create_client(), since=since)
+
+def connect_opensearch(client=None):
+    # --- Create client ---
+    # the async path needs no separate ping, its first query fails if the cluster is unreachable
+    if INGEST_MODE != "async":
+        client = client or create_client()
+        if client.ping():
+            print("✅ Successfully connected to OpenSearch!")
+        else:
+            print("⚠️ Connection established but ping failed.")
+            exit(1)
+
+    with instrument.stage("load_cache") as s:
+        cached = cache.load_cache()
+        rollups = cache.load_rollups()
+        s["rows"] = sum(len(v) for v in cached.values())
+    since = window.query_since(cache.last_seen(cached), rollups)
+    for platform, stamp in since.items():
+        print(f"Fetching {platform} records since {stamp}")
+    with instrument.stage("fetch") as s:
+        fresh = fetch_records(client, since)
+        s["rows"] = sum(len(v) for v in fresh.values())
+    with instrument.stage("merge_cache"):
+        Platform_DATA = cache.merge(cached, fresh)
+        expired = 0
+        if window.enabled():
+            Platform_DATA, rollups, expired = window.apply_window(Platform_DATA, rollups, TIME_METRICS + MEMORY_METRICS)
+            print(f"Analysis window keeps {sum(len(v) for v in Platform_DATA.values())} records, {expired} rolled up")
+        if fresh or expired:
+            cache.save_cache(Platform_DATA)
+        if expired:
+            cache.save_rollups(rollups)
+    print(f"DataFrame memory footprint: {ingest.memory_footprint(Platform_DATA) / 2**20:.1f} MiB")
+    if SUMMARY_MODE == "opensearch":
+        with instrument.stage("summary_pushdown"):
+            client = client or create_client()
+            platform_summary = pushdown.platform_summary(client, TIME_METRICS + MEMORY_METRICS)
+            BUNDLE_SUMMARY.update(pushdown.bundle_summaries(client, TIME_METRICS + MEMORY_METRICS))
     else:
-        print("⚠️ Connection established but ping failed.")
-        exit(1)
-
-    index_name = "crc-test"
-    query = {
-        "size": 10000, 
-        "query": {
-            "wildcard": {
-                "category.keyword": "openshift-*"   # use the .keyword field for exact matching
-            }
-        }
-    }
-    response = client.search(index=index_name, body=query)
-    hits = [hit["_source"] for hit in response["hits"]["hits"]]
-    print(f"Total {len(hits)} records")
-
-    df = pd.DataFrame(hits)
-    df["category"] = df["category"].astype("category")
-    platform_map = {
-        "openshift-darwin-amd64": "darwin-amd64",
-        "openshift-darwin-arm64": "darwin-arm64",
-        "openshift-linux-amd64": "linux-amd64",
-        "openshift-linux-arm64": "linux-arm64",
-        "openshift-windows-amd64": "windows-amd64",
-    }
-    df = df[df["category"].isin(platform_map.keys())]
-    Platform_DATA = {
-        platform_map[k]: v.reset_index(drop=True)
-        for k, v in df.groupby("category", observed=True)
-    }
-    '''
-    MAC_AMD_data = df[df['category'] == 'openshift-darwin-amd64']
-    MAC_ARM_data = df[df['category'] == 'openshift-darwin-arm64']
-    LINUX_AMD_data = df[df['category'] == 'openshift-linux-amd64']
-    LINUX_ARM_data = df[df['category'] == 'openshift-linux-arm64']
-    WINDOWS_data = df[df['category'] == 'openshift-windows-amd64']
-    Platform_DATA={
-        "darwin-amd64": MAC_AMD_data,
-        "darwin-arm64": MAC_ARM_data,
-        "linux-amd64": LINUX_AMD_data,
-        "linux-arm64": LINUX_ARM_data,
-        "windows-amd64": WINDOWS_data,
-    }
-    '''
-    time_platform = time_by_platform(df)
-    memory_platform = memory_by_platform(df)
+        if Platform_DATA:
+            df = pd.concat(Platform_DATA.values(), ignore_index=True)
+            platform_summary = aggregate.summarize(df, "category", TIME_METRICS + MEMORY_METRICS)
+        else:
+            # no runs at all in the analysis window
+            platform_summary = aggregate.empty_summary(TIME_METRICS + MEMORY_METRICS)
+        if rollups:
+            # the tables keep the long-term context of the rows that left the analysis window
+            categories = {platform: category for category, platform in ingest.PLATFORM_MAP.items()}
+            platform_summary = window.combine(
+                platform_summary, window.platform_totals(rollups, categories), TIME_METRICS + MEMORY_METRICS)
+            bundle_summary = summarize_by_bundle(Platform_DATA)
+            for platform in sorted(set(bundle_summary) | set(rollups)):
+                if platform in rollups:
+                    BUNDLE_SUMMARY[platform] = window.combine(
+                        bundle_summary.get(platform), rollups[platform], TIME_METRICS + MEMORY_METRICS)
+                else:
+                    BUNDLE_SUMMARY[platform] = bundle_summary[platform]
+    time_platform = time_by_platform(platform_summary)
+    memory_platform = memory_by_platform(platform_summary)
     return time_platform, memory_platform, Platform_DATA
 
+def export_frame(frame, family, key, path):
+    with instrument.stage("export", family=family, platform=key, rows=len(frame)) as s:
+        inputs = manifest.inputs_hash(family, frame)
+        partition = export.partition_path(RESULT_FOLDER, family, key)
+        s["skipped"] = manifest.unchanged(partition, inputs)
+        if not s["skipped"]:
+            manifest.record(export.write_partition(frame, RESULT_FOLDER, family, key), inputs)
+        # otava reads the CSVs from disk, so they are written even when unchanged
+        if EXPORT_CSV and (REGRESSION_BACKEND == "otava" or not manifest.unchanged(path, inputs)):
+            frame.to_csv(path, index=False)
+            manifest.record(path, inputs)
+    # the native regression backend reads the frames from memory instead of re-parsing the CSVs
+    if REGRESSION_BACKEND == "native":
+        EXPORTED_FRAMES[path] = frame
+
 def export_time_csv(Platform_DATA):
     for key, value in Platform_DATA.items():
         cols = ["time-start", "time-stop", "bundle", "timestamp"]
@@ -83,12 +176,7 @@ def export_time_csv(Platform_DATA):
             .dropna(subset=["time-start"]) 
         )
 
-        df_to_export.to_csv(
-            f"{RESULT_FOLDER}/time_consume_{key}.csv",
-            index=False
-        )
-        del df_to_export
-        gc.collect()
+        export_frame(df_to_export, "time", key, f"{RESULT_FOLDER}/time_consume_{key}.csv")
         '''
         df_to_export = value[['time-start', 'time-stop', 'bundle', 'timestamp']].copy()
         df_to_export = df_to_export.dropna(subset=["time-start"])
@@ -108,46 +196,25 @@ def export_memory_csv(Platform_DATA):
             .loc[:, cols]                       
             .dropna(subset=["memory-start"])   
         )
-        df_to_export.to_csv(
-            f"{RESULT_FOLDER}/memory_consume_{key}.csv",
-            index=False
-        )
-        del df_to_export
-        gc.collect()
+        export_frame(df_to_export, "memory", key, f"{RESULT_FOLDER}/memory_consume_{key}.csv")
         '''
         df_to_export = value[['memory-start', 'memory-deployment', 'memory-stop', 'bundle', 'timestamp']]
         df_to_export = df_to_export.dropna(subset=["memory-start"])
         df_to_export.to_csv(f"{RESULT_FOLDER}/memory_consume_{key}.csv", index=False)
         '''
 
-def flatten_nested(obj):
-    items = []
-    if isinstance(obj, dict):
-        for k, v in obj.items():
-            new_key = k
-            if isinstance(v, (dict, list)):
-                items.extend(flatten_nested(v).items())
-            else:
-                items.append((new_key, v))
-    elif isinstance(obj, list):
-        for i, v in enumerate(obj):
-            new_key =  str(i)
-            if isinstance(v, (dict, list)):
-                items.extend(flatten_nested(v).items())
-            else:
-                items.append((new_key, v))
-    return dict(items)
-
 def get_cpu_data(item, Platform_DATA):#item list["cpu-Start","cpu-Stop"]
     CPU_data={}
+    prefix = f"{item}."
     for key, value in Platform_DATA.items():
-        mask = value[item].apply(lambda x: isinstance(x, dict) and "derived" in x)
+        cols = [c for c in value.columns if c.startswith(prefix)]
+        if not cols:
+            continue
+        mask = value[cols].notna().any(axis=1)
         if not mask.any():
             continue
         filtered = value.loc[mask]
-        derived_df = pd.json_normalize(
-            filtered[item].map(lambda x: flatten_nested(x["derived"]))
-        )
+        derived_df = filtered[cols].rename(columns=lambda c: c[len(prefix):])
         derived_df = derived_df.assign(
             timestamp=filtered["timestamp"].values,
             bundle=filtered["bundle"].values,
@@ -161,80 +228,57 @@ def get_cpu_data(item, Platform_DATA):#item list["cpu-Start","cpu-Stop"]
     return CPU_data
 
 
-def draw_by_platform(item, image_folder, data):
-    plt.figure(figsize=(8, 5), dpi=150)
-    for key, value in data.items():
-        value = value.copy()
-        value['timestamp'] = pd.to_datetime(value['timestamp'])
-        plt.plot(value['timestamp'], value[item], label=key)
-
-    plt.title(f"{item} over Time")
-    plt.xlabel("Time")
-    plt.ylabel("Value")
-    plt.legend()
-    plt.tight_layout()
-    plt.savefig(f"{image_folder}/{item}.png")
-    plt.close()
-
 def draw_all(Platform_DATA):
-    draw_by_platform("time-start",RESULT_FOLDER, Platform_DATA)
-    draw_by_platform("time-stop",RESULT_FOLDER, Platform_DATA)
-    draw_by_platform("memory-start",RESULT_FOLDER, Platform_DATA)
-    draw_by_platform("memory-stop",RESULT_FOLDER, Platform_DATA)
-    draw_by_platform("memory-deployment",RESULT_FOLDER, Platform_DATA)
-
-
-def sort_by_bundle(data,item):
-    return data.groupby('bundle')[item].mean().reset_index().to_dict(orient='records')
+    jobs, inputs = [], {}
+    for item in TIME_METRICS + MEMORY_METRICS:
+        series = {
+            key: (value["timestamp"].to_numpy(), value[item].to_numpy())
+            for key, value in Platform_DATA.items()
+        }
+        if not series:
+            continue
+        inputs[item] = manifest.inputs_hash(item, *(part for key, arrays in series.items() for part in (key, *arrays)))
+        if not manifest.unchanged(f"{RESULT_FOLDER}/{item}.png", inputs[item]):
+            jobs.append((item, charts.draw_by_platform, (item, RESULT_FOLDER, series)))
+    for name, seconds in charts.render_charts(jobs, 1 if PROFILE else None):
+        manifest.record(f"{RESULT_FOLDER}/{name}.png", inputs[name])
+        instrument.add("chart", chart=name, wall_seconds=round(seconds, 4))
+
+
+def summarize_by_bundle(Platform_DATA):
+    return {
+        key: memo.summarize(value, "bundle", TIME_METRICS + MEMORY_METRICS, namespace=key)
+        for key, value in Platform_DATA.items()
+    }
 
-def time_by_bundle(Platform_DATA):
-    start_result={}
-    stop_result={}
-    for key, value in Platform_DATA.items():
-        start_result[key]=sort_by_bundle(value,"time-start")
-        conver_time_format(start_result[key],"time-start")
-        stop_result[key]=sort_by_bundle(value,"time-stop")
-        conver_time_format(stop_result[key],"time-stop")
-    return start_result, stop_result
-
-def memory_by_bundle(Platform_DATA):
-    start_result={}
-    deployment_result={}
-    stop_result={}
-    for key, value in Platform_DATA.items():
-        start_result[key]=sort_by_bundle(value,"memory-start")
-        deployment_result[key]=sort_by_bundle(value,"memory-deployment")
-        stop_result[key]=sort_by_bundle(value,"memory-stop")
-    return start_result, deployment_result, stop_result
+def time_by_bundle(bundle_summary):
+    return (
+        aggregate.bundle_table(bundle_summary, "time-start"),
+        aggregate.bundle_table(bundle_summary, "time-stop"),
+    )
 
-def sort_by_platform(df,item):
-    return df.groupby('category', observed=True)[item].mean().reset_index().to_dict(orient='records')
+def memory_by_bundle(bundle_summary):
+    return (
+        aggregate.bundle_table(bundle_summary, "memory-start"),
+        aggregate.bundle_table(bundle_summary, "memory-deployment"),
+        aggregate.bundle_table(bundle_summary, "memory-stop"),
+    )
 
-def time_by_platform(df):
+def time_by_platform(platform_summary):
     result={}
-    for field in ("time-start", "time-stop"):
-        data = sort_by_platform(df, field)
-        conver_time_format(data, field)
-        result[field.split("-")[1]] = data
+    for field in TIME_METRICS:
+        phase = field.split("-")[1]
+        result[phase] = aggregate.platform_table(platform_summary, field, f"Average time of CRC {phase}")
     return result
 
-def conver_time_format(datalist, item):
-    for row in datalist:
-        row[item] = seconds_to_mmss(row[item])
-
-def seconds_to_mmss(seconds):
-    minutes = int(seconds // 60)
-    sec = int(seconds % 60)
-    return f"{minutes}m{sec:02d}s"
-
-def memory_by_platform(df):
+def memory_by_platform(platform_summary):
     result={}
     for field, name in [
         ("memory-start", "start"),
         ("memory-deployment", "deployment"),
         ("memory-stop", "stop"),
     ]:
-        result[name] = sort_by_platform(df, field)
+        result[name] = aggregate.platform_table(platform_summary, field, "Average Memory Usage (MiB)")
     return result
 
 def draw_cpu(platfrom, folder, data):
@@ -242,7 +286,7 @@ def draw_cpu(platfrom, folder, data):
     for col in data.select_dtypes(include=['float', 'int']).columns:
         if col == 'timestamp':
             continue
-        plt.plot(data['timestamp'], data[col], label=col)
+        plt.plot(*downsample.downsample(data['timestamp'], data[col]), label=col)
 
     plt.title(f"{platfrom} over Time")
     plt.xlabel("Time")
@@ -262,27 +306,18 @@ def export_cpu_csv(Platform_DATA):
         
         cpudata = get_cpu_data(item, Platform_DATA)
         bundle_data = {}
-        for key, _ in Platform_DATA.items(): 
-            filtered_df = cpudata[key]
-            filtered_df.to_csv(f"{folder}/{item}_{key}.csv", index=False)
+        # platforms without CPU samples in the analysis window have no table
+        for key, filtered_df in cpudata.items():
+            export_frame(filtered_df, item, key, f"{folder}/{item}_{key}.csv")
             #draw_cpu(f"{item}_{key}", folder, filtered_df)
-            indexdata = {}
-            for index in ["max", "Min", "Mean", "P95", "Std", "Spike Count", "gt_80", "lt_20", "lt_10"]:
-                data = sort_by_bundle(filtered_df, index)
-                indexdata[index] = data
-
-            bundle_data[key] = indexdata
-        cpu_bundle[item] = bundle_data
-
-    env = Environment(loader=FileSystemLoader('.'))    
-    templateCpu = env.get_template('template/cpu-consume.html')
-    html_cpu = templateCpu.render(startData=cpu_bundle["cpu-Start"], stopData=cpu_bundle["cpu-Stop"])
-    with open(f"{RESULT_FOLDER}/cpu-consume.html", 'w', encoding='utf-8') as f:
-        f.write(html_cpu)
-    print("✅ HTML file generated: cpu-consume.html")
-
-def generate_html_report(time_platform, memory_platform, Platform_DATA, regression):
-    start_time, stop_time = time_by_bundle(Platform_DATA)
+            summary = memo.summarize(filtered_df, "bundle", ingest.CPU_METRICS, namespace=f"{item}/{key}")
+            bundle_data[key] = aggregate.metric_table(summary, ingest.CPU_METRICS)
+        cpu_bundle[item.split("-")[1].lower()] = bundle_data
+    return cpu_bundle
+
+def generate_html_report(time_platform, memory_platform, Platform_DATA, regression, cpuData):
+    bundle_summary = BUNDLE_SUMMARY or summarize_by_bundle(Platform_DATA)
+    start_time, stop_time = time_by_bundle(bundle_summary)
     timeData = {
         "platform" : time_platform,
         "bundle": {
@@ -290,7 +325,7 @@ def generate_html_report(time_platform, memory_platform, Platform_DATA, regressi
             "stop": stop_time
         }
     }
-    start, deploy, stop = memory_by_bundle(Platform_DATA)
+    start, deploy, stop = memory_by_bundle(bundle_summary)
     memoryData = {
         "platform" : memory_platform,
         "bundle": {
@@ -300,59 +335,93 @@ def generate_html_report(time_platform, memory_platform, Platform_DATA, regressi
         }
     }
 
-
-
-    env = Environment(loader=FileSystemLoader('.'))
-    ## genrate time-consume.html
-    templateTime = env.get_template('template/time-consume.html')
-    html_time = templateTime.render(timeData=timeData)
-    with open(f"{RESULT_FOLDER}/time-consume.html", 'w', encoding='utf-8') as f:
-        f.write(html_time)
-    print("✅ HTML file generated: time-consume.html")
-    ## genrate memory-consume.html
-    templateMemory = env.get_template('template/memory-consume.html')
-    html_memory = templateMemory.render(memoryData=memoryData)
-    with open(f"{RESULT_FOLDER}/memory-consume.html", 'w', encoding='utf-8') as f:
-        f.write(html_memory)
-    print("✅ HTML file generated: memory-consume.html")
-    ## genrate regression.html
-    templateregression = env.get_template('template/regression.html')
-    html_regression = templateregression.render(regression=regression)
-    with open(f"{RESULT_FOLDER}/regression.html", 'w', encoding='utf-8') as f:
-        f.write(html_regression)
-    print("✅ HTML file generated: regression.html")
-    ## genrate Performance_report.html
-    template = env.get_template('template/ReportTemplate.html')
-    html_output = template.render()
-    with open(f"{RESULT_FOLDER}/Performance_report.html", 'w', encoding='utf-8') as f:
-        f.write(html_output)
-    print("✅ HTML file generated: Performance_report.html")
-
-def otava_regression_check(config_path):
-    RegressionResult = ""
-    for p in ("darwin-amd", "darwin-arm","linux-amd", "linux-arm", "windows-amd"):
-        stdout = otava.run_otava(p, config_path)
-        RegressionResult += otava.handle_regression_result(stdout)+"\n"
-    return RegressionResult
-
-def get_regression_result():
-    RegressionResult={}
-    for config in ("otava-time.yaml", "otava-memory.yaml", "otava-cpu.yaml"):
-        key=config.replace("otava-","").replace(".yaml","")
-        RegressionResult[key] = otava_regression_check(config)
-    return RegressionResult
+    pages = [
+        ('template/time-consume.html', f"{RESULT_FOLDER}/time-consume.html", {
+            "data_json": report.to_json(timeData),
+            "series_json": report.to_json(series.family_payload(Platform_DATA, TIME_METRICS)),
+        }),
+        ('template/memory-consume.html', f"{RESULT_FOLDER}/memory-consume.html", {
+            "data_json": report.to_json(memoryData),
+            "series_json": report.to_json(series.family_payload(Platform_DATA, MEMORY_METRICS)),
+        }),
+        ('template/cpu-consume.html', f"{RESULT_FOLDER}/cpu-consume.html", {"data_json": report.to_json(cpuData)}),
+        ('template/regression.html', f"{RESULT_FOLDER}/regression.html", {"regression": regression}),
+        ('template/ReportTemplate.html', f"{RESULT_FOLDER}/Performance_report.html", {}),
+    ]
+    templates = manifest.template_hash()
+    inputs = {path: manifest.inputs_hash(templates, name, json.dumps(context, sort_keys=True, default=str))
+              for name, path, context in pages}
+    for path in report.render_pages([page for page in pages if not manifest.unchanged(page[1], inputs[page[1]])]):
+        manifest.record(path, inputs[path])
+
+def config_frames(config):
+    """The exported frames an otava config reads, for the native backend."""
+    paths = {test["file"] for test in changepoint.load_config(config).values()}
+    return {path: frame for path, frame in EXPORTED_FRAMES.items() if path in paths}
+
+def export_family(export_func, config, Platform_DATA):
+    exported = export_func(Platform_DATA)
+    # a CSV left over from an earlier run, e.g. of a platform that left the window, would still be analysed
+    for test in changepoint.load_config(config).values():
+        if manifest.discard_stale(test["file"]):
+            print(f"🗑️ Removed stale export {test['file']}")
+    return exported, config_frames(config)
+
+def collect_regression(*changes):
+    result = {analysis.config_key(config): c for config, c in zip(otava.OTAVA_CONFIGS, changes)}
+    return get_regression_result(result)
+
+def get_regression_result(result=None):
+    if result is None:
+        result = analysis.run_analysis(REGRESSION_BACKEND, EXPORTED_FRAMES)
+    analysis.save_artifact(analysis.to_records(result), f"{RESULT_FOLDER}/{analysis.ARTIFACT_NAME}")
+    print(f"✅ Regression result saved: {analysis.ARTIFACT_NAME}")
+    return analysis.regression_text(result)
+
+def pipeline_stages():
+    """The report pipeline as stages with their input and output artifacts, for src/scheduler.py."""
+    Stage = scheduler.Stage
+    # the native detector is CPU-bound Python, otava jobs are subprocesses waited on from threads
+    regression_kind = "process" if REGRESSION_BACKEND == "native" else "thread"
+    configs = dict(zip(("time", "memory", "cpu"), otava.OTAVA_CONFIGS))
+    stages = [
+        Stage("connect_opensearch", connect_opensearch,
+              outputs=("time_platform", "memory_platform", "Platform_DATA")),
+        Stage("export_time_csv", export_family, args=(export_time_csv, configs["time"]),
+              inputs=("Platform_DATA",), outputs=("time_csv", "time_frames")),
+        Stage("export_memory_csv", export_family, args=(export_memory_csv, configs["memory"]),
+              inputs=("Platform_DATA",), outputs=("memory_csv", "memory_frames")),
+        Stage("export_cpu_csv", export_family, args=(export_cpu_csv, configs["cpu"]),
+              inputs=("Platform_DATA",), outputs=("cpuData", "cpu_frames")),
+    ]
+    for family, config in configs.items():
+        stages.append(Stage(f"regression_{family}", analysis.run_config, args=(REGRESSION_BACKEND, config),
+                            inputs=(f"{family}_frames",), outputs=(f"{family}_changes",), kind=regression_kind))
+    stages.append(Stage("get_regression_result", collect_regression,
+                        inputs=tuple(f"{family}_changes" for family in configs), outputs=("regression",)))
+    if RENDER_PNG:
+        stages.append(Stage("draw_all", draw_all, inputs=("Platform_DATA",), outputs=("png",)))
+    stages.append(Stage("generate_html_report", generate_html_report,
+                        inputs=("time_platform", "memory_platform", "Platform_DATA", "regression", "cpuData"),
+                        outputs=("pages",)))
+    return stages
 
 if __name__ == "__main__":
-    # Remove the result folder if it exists, then create it
-    if os.path.exists(RESULT_FOLDER):
-        shutil.rmtree(RESULT_FOLDER)
-    os.makedirs(RESULT_FOLDER)
-
-    time_platform, memory_platform, Platform_DATA = connect_opensearch()
-    export_time_csv(Platform_DATA)
-    export_memory_csv(Platform_DATA)
-    export_cpu_csv(Platform_DATA)
-    draw_all(Platform_DATA)
-    regression = get_regression_result()
-    generate_html_report(time_platform, memory_platform, Platform_DATA, regression)
-    
\ No newline at end of file
+    # artifacts whose inputs match the previous run's manifest are not regenerated
+    os.makedirs(RESULT_FOLDER, exist_ok=True)
+    manifest.load(RESULT_FOLDER)
+
+    with instrument.profiled(PROFILE, f"{RESULT_FOLDER}/profile"):
+        # the profilers only see the thread that started them, so the stages then run in it one at a time
+        scheduler.run(pipeline_stages(), serial=bool(PROFILE))
+
+    if memo.MEMO_FOLDER:
+        instrument.add("memo", **memo.STATS)
+        print(f"Bundle statistics: {memo.STATS['hits']} reused, {memo.STATS['misses']} recomputed")
+    instrument.save(f"{RESULT_FOLDER}/pipeline_metrics.json")
+    print("✅ Pipeline metrics saved: pipeline_metrics.json")
+    if PIPELINE_METRICS_INDEX:
+        instrument.push(create_client(), PIPELINE_METRICS_INDEX)
+    changed, skipped, removed = manifest.save()
+    print(f"✅ Manifest saved: {len(changed)} changed files to upload, {skipped} unchanged artifacts skipped,"
+          f" {removed} stale files removed")
@@ -1,9 +1,10 @@
-from src import otava
-import json
+from src import analysis
 from datetime import datetime, timezone
 import os
 CURRENT_TIMEZONE = timezone.utc
 webhook_url = os.environ.get("SLACK_WEBHOOK_URL", "")
+RESULT_FOLDER = "result"
+REPORT_URL = "https://crcqe-asia.s3.ap-south-1.amazonaws.com/nightly/crc/test"
  
 def get_date(time_val):
     dt_object = datetime.fromtimestamp(time_val, CURRENT_TIMEZONE)
@@ -29,30 +30,31 @@ def send_slack_webhook(message):
         print(f"⚠️ Exception occurred while sending Slack notification: {e}")   
 
 message=""
-for config in ("otava-time.yaml", "otava-memory.yaml", "otava-cpu.yaml"):
-    key=config.replace("otava-","").replace(".yaml","")
-    
-    for p in ("darwin-amd", "darwin-arm","linux-amd", "linux-arm", "windows-amd"):
-        stdout = otava.run_otava(p, config, "json")
-        data = json.loads(stdout)
-        #print(data)
-        changedata = data.get(p, [])
-        
-        for items in changedata:
-            changes_list = items.get("changes", [])
-            time = items.get("time", 0)
-            changedate = get_date(time)
+metrics=set()
+try:
+    records = analysis.load_artifact(f"{RESULT_FOLDER}/{analysis.ARTIFACT_NAME}")
+except FileNotFoundError:
+    print(f"⚠️ {RESULT_FOLDER}/{analysis.ARTIFACT_NAME} not found, run performance_analyze.py first.")
+    exit(1)
+
+today = get_today()
+changes = {}
+for record in records:
+    changedate = get_date(record["time"])
+    if changedate == today:
+        changes.setdefault((record["config"], record["platform"], changedate), []).append(record)
+
+for (key, p, changedate), changes_list in changes.items():
+    message += f"CRC performance change found for `{key}` on `{p}` at {changedate}:\n"
+    for change in changes_list:
+        metrics.add(change["metric"])
+        message += f"{change['metric']} : {round(change['mean_before'], 2)} => {round(change['mean_after'], 2)}\n"
 
-            if changedate == get_today():
-                if(len(changes_list)>0):
-                    message += f"CRC performance change found for `{key}` on `{p}` at {changedate}:\n"
-                for change in changes_list:
-                    message += f"{change.get('metric','')} : {round(float(change.get('mean_before','')), 2)} => {round(float(change.get('mean_after','')), 2)}\n"
-                
 if(message != ""):
-    if "time-stop" in message:
-        message += "https://crcqe-asia.s3.ap-south-1.amazonaws.com/nightly/crc/test/time-stop.png"+"\n"
-    if "time-start" in message:
-        message += "https://crcqe-asia.s3.ap-south-1.amazonaws.com/nightly/crc/test/time-start.png"+"\n"
-    message += f"Check details in <https://crcqe-asia.s3.ap-south-1.amazonaws.com/nightly/crc/test/Performance_report.html|Performance Report>"
-    send_slack_webhook(message)     
\ No newline at end of file
+    # the charts are drawn in the report pages, each metric has an anchor on its family's page
+    for metric in sorted(metrics):
+        family = metric.split("-")[0]
+        if family in ("time", "memory"):
+            message += f"<{REPORT_URL}/{family}-consume.html#chart-{metric}|{metric} chart>"+"\n"
+    message += f"Check details in <{REPORT_URL}/Performance_report.html|Performance Report>"
+    send_slack_webhook(message)
\ No newline at end of file
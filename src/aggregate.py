@@ -0,0 +1,73 @@
+import math
+import pandas as pd
+
+STATS = ["mean", "median", "std", "count"]
+QUANTILES = {"p95": 0.95}
+# statistics shipped to the report tables
+TABLE_STATS = ("mean", "median", "p95", "count")
+
+
+def summarize(df, by, metrics):
+    """Compute every statistic of every metric per `by` key in a single grouped pass.
+
+    The result is indexed by the key and has one (metric, stat) column per pair.
+    """
+    grouped = df.groupby(by, observed=True, sort=True)[metrics]
+    summary = grouped.agg(STATS)
+    for name, q in QUANTILES.items():
+        quantile = grouped.quantile(q)
+        for metric in metrics:
+            summary[(metric, name)] = quantile[metric]
+    return summary
+
+
+def empty_summary(metrics):
+    """A summary without keys, with the columns summarize would produce."""
+    return pd.DataFrame(columns=pd.MultiIndex.from_tuples(
+        [(metric, stat) for metric in metrics for stat in STATS]
+        + [(metric, name) for name in QUANTILES for metric in metrics]
+    ))
+
+
+def _number(value, stat):
+    if value is None:
+        return None
+    value = float(value)
+    if math.isnan(value):
+        return None
+    return int(value) if stat == "count" else round(value, 2)
+
+
+def _aligned(stats, columns):
+    stats = stats.set_axis(stats.index.astype(str)).reindex(columns)
+    return {stat: [_number(v, stat) for v in stats[stat]] for stat in TABLE_STATS}
+
+
+def bundle_table(summaries, metric):
+    """One row per platform, one column per bundle, for a metric of per-platform summaries."""
+    columns = sorted(set().union(*(map(str, summary.index) for summary in summaries.values())))
+    return {
+        "columns": columns,
+        "rows": [{"label": label, **_aligned(summary[metric], columns)} for label, summary in summaries.items()],
+    }
+
+
+def metric_table(summary, metrics):
+    """One row per metric, one column per bundle, for a single summary."""
+    columns = [str(bundle) for bundle in summary.index]
+    return {
+        "columns": columns,
+        "rows": [{"label": metric, **_aligned(summary[metric], columns)} for metric in metrics],
+    }
+
+
+def platform_table(summary, metric, header):
+    """One row per platform with a single column named header."""
+    stats = summary[metric]
+    return {
+        "columns": [header],
+        "rows": [
+            {"label": str(label), **{stat: [_number(stats.at[label, stat], stat)] for stat in TABLE_STATS}}
+            for label in stats.index
+        ],
+    }
@@ -0,0 +1,88 @@
+import os
+import json
+from src import otava
+from src import changepoint
+from src import instrument
+
+ARTIFACT_NAME = "regression.json"
+# otava's JSON output gives these as formatted strings
+NUMERIC_FIELDS = ("mean_before", "mean_after", "stddev_before", "stddev_after", "pvalue", "forward_change_percent")
+
+
+def config_key(config):
+    return config.replace("otava-", "").replace(".yaml", "")
+
+
+def _with_direction(change_points, test_config):
+    """Parse otava's change points: numeric fields as floats and each metric's configured direction."""
+    options = changepoint.metric_options(test_config["metrics"])
+    for cp in change_points:
+        for change in cp["changes"]:
+            for field in NUMERIC_FIELDS:
+                if field in change:
+                    change[field] = float(change[field])
+            change.setdefault("direction", options.get(change.get("metric"), {}).get("direction", 1))
+    return change_points
+
+
+def run_config(backend, config, frames=None):
+    """Change points of every test of one otava config: {test: [change point]}."""
+    if backend == "native":
+        with instrument.stage("changepoint", config=config):
+            return changepoint.analyze_config(config, otava.OTAVA_TESTS, frames)
+
+    tests = changepoint.load_config(config)
+    # nothing was exported for a test without runs in the analysis window, so otava has no file to read
+    exported = [p for p in otava.OTAVA_TESTS if os.path.exists(tests[p]["file"])]
+    results = otava.run_otava_jobs([(p, config) for p in exported], "json")
+    for r in results:
+        instrument.add("otava", test=r["test"], config=r["config"], wall_seconds=round(r["seconds"], 4),
+                       child_cpu_seconds=round(r["cpu_seconds"], 4))
+    change_points = {p: [] for p in otava.OTAVA_TESTS}
+    for r in otava.check_results(results):
+        change_points[r["test"]] = _with_direction(json.loads(r["stdout"]).get(r["test"], []), tests[r["test"]])
+    return change_points
+
+
+def run_analysis(backend="otava", frames=None):
+    """Change points for every otava config and test: {config key: {test: [change point]}}."""
+    return {config_key(config): run_config(backend, config, frames) for config in otava.OTAVA_CONFIGS}
+
+
+def to_records(analysis):
+    records = []
+    for key, tests in analysis.items():
+        for test, change_points in tests.items():
+            for cp in change_points:
+                for change in cp["changes"]:
+                    records.append({
+                        "config": key,
+                        "platform": test,
+                        "metric": change["metric"],
+                        "time": cp["time"],
+                        "mean_before": float(change["mean_before"]),
+                        "mean_after": float(change["mean_after"]),
+                        "regression": changepoint.is_regression(change),
+                    })
+    return records
+
+
+def regression_text(analysis):
+    """Per config key, the regressions_only style text shown in regression.html."""
+    return {
+        key: "".join(
+            otava.handle_regression_result(changepoint.format_regressions(tests.get(p, []))) + "\n"
+            for p in otava.OTAVA_TESTS
+        )
+        for key, tests in analysis.items()
+    }
+
+
+def save_artifact(records, path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(records, f, indent=1)
+
+
+def load_artifact(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
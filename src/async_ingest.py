@@ -0,0 +1,174 @@
+import os
+import random
+import asyncio
+import pandas as pd
+from src import ingest
+
+CONCURRENCY = int(os.environ.get("OPENSEARCH_CONCURRENCY", "4"))
+SLICE_DAYS = int(os.environ.get("OPENSEARCH_SLICE_DAYS", "30"))
+RETRIES = int(os.environ.get("OPENSEARCH_RETRIES", "3"))
+BACKOFF_SECONDS = float(os.environ.get("OPENSEARCH_BACKOFF", "0.5"))
+# statuses worth retrying: throttling and a busy or restarting cluster
+RETRY_STATUSES = (429, 502, 503, 504)
+
+
+def _retryable(error):
+    from opensearchpy.exceptions import ConnectionError, TransportError
+    if isinstance(error, ConnectionError):
+        return True
+    return isinstance(error, TransportError) and error.status_code in RETRY_STATUSES
+
+
+async def with_retries(call, *args, **kwargs):
+    """Await call, retrying connection errors and throttling with jittered exponential backoff."""
+    for attempt in range(RETRIES + 1):
+        try:
+            return await call(*args, **kwargs)
+        except Exception as e:
+            if attempt == RETRIES or not _retryable(e):
+                raise
+            delay = BACKOFF_SECONDS * 2 ** attempt * random.uniform(0.5, 1.5)
+            print(f"⚠️ OpenSearch request failed ({e}), retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+
+def build_bounds_query(since=None):
+    """First and last timestamp of every platform, to cut its history into slices."""
+    return {
+        "size": 0,
+        "query": ingest.build_query(since)["query"],
+        "aggs": {
+            "platforms": {
+                "terms": {"field": "category.keyword", "size": len(ingest.PLATFORM_MAP)},
+                "aggs": {"first": {"min": {"field": "timestamp"}}, "last": {"max": {"field": "timestamp"}}},
+            }
+        },
+    }
+
+
+def time_slices(first, last, days=SLICE_DAYS):
+    """Consecutive [start, end) ranges covering first..last; the last one is open-ended."""
+    edges = list(pd.date_range(first, last, freq=f"{days}D"))[1:] if days else []
+    bounds = [None, *edges, None]
+    return [(bounds[i], bounds[i + 1]) for i in range(len(bounds) - 1)]
+
+
+def build_slice_query(category, start, end, since=None):
+    query = ingest.build_query()
+    filters = query["query"]["bool"]["filter"]
+    filters[0] = {"terms": {"category.keyword": [category]}}
+    platform_since = (since or {}).get(ingest.PLATFORM_MAP[category])
+    if platform_since is not None:
+        filters.append(ingest.since_filter(platform_since))
+    bounds = {}
+    if start is not None:
+        bounds["gte"] = start.isoformat()
+    if end is not None:
+        bounds["lt"] = end.isoformat()
+    if bounds:
+        filters.append({"range": {"timestamp": bounds}})
+    return query
+
+
+async def scroll_slice(client, index, query, page_size, on_page):
+    """Scroll one slice without retries: a repeated scroll request may skip the page the server already served."""
+    response = await client.search(index=index, body=query, size=page_size, scroll=ingest.SCROLL_KEEP_ALIVE)
+    scroll_id = response.get("_scroll_id")
+    try:
+        while True:
+            hits = response["hits"]["hits"]
+            if not hits:
+                break
+            on_page(hits)
+            if len(hits) < page_size:
+                break
+            response = await client.scroll(scroll_id=scroll_id, scroll=ingest.SCROLL_KEEP_ALIVE)
+            scroll_id = response.get("_scroll_id", scroll_id)
+    finally:
+        if scroll_id:
+            try:
+                await client.clear_scroll(scroll_id=scroll_id)
+            except Exception as e:
+                # the scroll expires on its own; do not mask the error that ended the slice
+                print(f"⚠️ Could not clear scroll {scroll_id}: {e}")
+
+
+async def load_platform_data(client, index=ingest.INDEX_NAME, since=None, page_size=ingest.PAGE_SIZE,
+                             concurrency=CONCURRENCY):
+    """Async counterpart of ingest.load_platform_data.
+
+    Every platform's history is cut into SLICE_DAYS slices that are scrolled
+    concurrently, at most concurrency at a time; pages go into the slice's
+    column buffer as they arrive. A slice that fails is scrolled again from
+    the start into a fresh buffer. Closes the client when done.
+    """
+    chunks = {platform: [] for platform in ingest.PLATFORM_MAP.values()}
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def scroll_into_buffer(query):
+        buffer = ingest.ColumnBuffer()
+
+        def on_page(hits):
+            for hit in hits:
+                source = hit["_source"]
+                if source.get("category") in ingest.PLATFORM_MAP:
+                    buffer.append(ingest.extract_cpu_derived({"_id": hit["_id"], **source}))
+
+        await scroll_slice(client, index, query, page_size, on_page)
+        return buffer
+
+    async def fetch(category, query):
+        async with semaphore:
+            buffer = await with_retries(scroll_into_buffer, query)
+        if buffer.rows:
+            chunks[ingest.PLATFORM_MAP[category]].append(buffer.to_frame())
+
+    try:
+        response = await with_retries(client.search, index=index, body=build_bounds_query(since))
+        jobs = []
+        for bucket in response["aggregations"]["platforms"]["buckets"]:
+            if bucket["key"] not in ingest.PLATFORM_MAP:
+                continue
+            first, last = bucket["first"].get("value_as_string"), bucket["last"].get("value_as_string")
+            slices = time_slices(pd.Timestamp(first), pd.Timestamp(last)) if first and last else [(None, None)]
+            for start, end in slices:
+                jobs.append(fetch(bucket["key"], build_slice_query(bucket["key"], start, end, since)))
+        await asyncio.gather(*jobs)
+    finally:
+        await client.close()
+
+    total = sum(len(frame) for frames in chunks.values() for frame in frames)
+    print(f"Total {total} records")
+    Platform_DATA = {}
+    for platform, frames in chunks.items():
+        if not frames:
+            continue
+        # slices complete in any order
+        frame = ingest.apply_schema(pd.concat(frames, ignore_index=True))
+        Platform_DATA[platform] = frame.sort_values(["timestamp", "_id"], kind="mergesort", ignore_index=True)
+    return Platform_DATA
+
+
+class AsyncReplayClient:
+    """Async wrapper of ingest.ReplayClient, with an optional simulated round trip latency in seconds."""
+
+    def __init__(self, client, latency=0.0):
+        self.client = client
+        self.latency = latency
+
+    async def _call(self, method, **kwargs):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return method(**kwargs)
+
+    async def search(self, **kwargs):
+        return await self._call(self.client.search, **kwargs)
+
+    async def scroll(self, **kwargs):
+        return await self._call(self.client.scroll, **kwargs)
+
+    async def clear_scroll(self, **kwargs):
+        return self.client.clear_scroll(**kwargs)
+
+    async def close(self):
+        pass
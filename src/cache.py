@@ -0,0 +1,115 @@
+import os
+import shutil
+import pandas as pd
+from src import ingest
+
+CACHE_FOLDER = os.environ.get("CACHE_FOLDER", "cache")
+# bump when the cached frames or rollups change shape; a cache of another version is discarded
+FORMAT_VERSION = "1"
+VERSION_FILE = "format-version"
+
+
+def _platform_file(folder, platform):
+    return os.path.join(folder, f"platform={platform}", "data.parquet")
+
+
+def _rollup_file(folder, platform):
+    return os.path.join(folder, f"platform={platform}", "rollup.parquet")
+
+
+def _write_version(folder):
+    os.makedirs(folder, exist_ok=True)
+    with open(os.path.join(folder, VERSION_FILE), "w", encoding="utf-8") as f:
+        f.write(FORMAT_VERSION)
+
+
+def check_version(folder=CACHE_FOLDER):
+    """Discard the cached frames and rollups unless they were written in FORMAT_VERSION.
+
+    Caches from before the version file, e.g. with the nested cpu-Start/cpu-Stop
+    blobs, would otherwise be merged with differently shaped rows.
+    """
+    try:
+        with open(os.path.join(folder, VERSION_FILE), encoding="utf-8") as f:
+            version = f.read().strip()
+    except FileNotFoundError:
+        version = None
+    if version == FORMAT_VERSION:
+        return True
+    stale = [name for name in os.listdir(folder) if name.startswith("platform=")]
+    if stale:
+        print(f"⚠️ Discarding the cache in {folder}: format {version or 'unversioned'}, expected {FORMAT_VERSION}")
+        for name in stale:
+            shutil.rmtree(os.path.join(folder, name))
+    _write_version(folder)
+    return False
+
+
+def load_cache(folder=CACHE_FOLDER):
+    Platform_DATA = {}
+    if not folder or not os.path.isdir(folder) or not check_version(folder):
+        return Platform_DATA
+    for name in sorted(os.listdir(folder)):
+        if not name.startswith("platform="):
+            continue
+        path = os.path.join(folder, name, "data.parquet")
+        if os.path.exists(path):
+            Platform_DATA[name.split("=", 1)[1]] = pd.read_parquet(path)
+    return Platform_DATA
+
+
+def last_seen(Platform_DATA):
+    """Last cached timestamp of every platform: {platform: ISO timestamp}."""
+    return {platform: v["timestamp"].max().isoformat() for platform, v in Platform_DATA.items() if len(v)}
+
+
+def merge(cached, fresh):
+    Platform_DATA = {}
+    for platform in sorted(set(cached) | set(fresh)):
+        frames = [d[platform] for d in (cached, fresh) if platform in d]
+        merged = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+        merged = merged.drop_duplicates(subset="_id", keep="last").reset_index(drop=True)
+        Platform_DATA[platform] = ingest.apply_schema(merged)
+    return Platform_DATA
+
+
+def save_cache(Platform_DATA, folder=CACHE_FOLDER):
+    if not folder:
+        return
+    _write_version(folder)
+    if os.path.isdir(folder):
+        # a platform with no rows left, e.g. all rolled up, must not be reloaded next run
+        for name in os.listdir(folder):
+            path = os.path.join(folder, name, "data.parquet")
+            if name.startswith("platform=") and name.split("=", 1)[1] not in Platform_DATA and os.path.exists(path):
+                os.remove(path)
+    for platform, value in Platform_DATA.items():
+        path = _platform_file(folder, platform)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + ".tmp"
+        value.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+
+
+def load_rollups(folder=CACHE_FOLDER):
+    """Per-platform rollups of the rows that left the analysis window, see src/window.py."""
+    rollups = {}
+    if not folder or not os.path.isdir(folder) or not check_version(folder):
+        return rollups
+    for name in sorted(os.listdir(folder)):
+        path = os.path.join(folder, name, "rollup.parquet")
+        if name.startswith("platform=") and os.path.exists(path):
+            rollups[name.split("=", 1)[1]] = pd.read_parquet(path)
+    return rollups
+
+
+def save_rollups(rollups, folder=CACHE_FOLDER):
+    if not folder:
+        return
+    _write_version(folder)
+    for platform, value in rollups.items():
+        path = _rollup_file(folder, platform)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + ".tmp"
+        value.to_parquet(tmp_path)
+        os.replace(tmp_path, path)
@@ -0,0 +1,218 @@
+import math
+import os
+import numpy as np
+import pandas as pd
+import yaml
+
+# same defaults as `otava analyze`
+MAX_PVALUE = float(os.environ.get("OTAVA_MAX_PVALUE", "0.001"))
+MIN_SEGMENT = 3
+# longer segments are searched in overlapping windows to bound the O(n^2) distance matrix
+MAX_WINDOW = 500
+
+
+def load_config(config_path):
+    with open(config_path, encoding="utf-8") as f:
+        return yaml.safe_load(f)["tests"]
+
+
+def metric_options(metrics):
+    if isinstance(metrics, list):
+        return {name: {"direction": 1, "threshold": 0.0} for name in metrics}
+    return {
+        name: {"direction": (opts or {}).get("direction", 1), "threshold": (opts or {}).get("threshold", 0.0)}
+        for name, opts in metrics.items()
+    }
+
+
+def _betacf(a, b, x):
+    qab, qap, qam = a + b, a + 1.0, a - 1.0
+    c, d = 1.0, 1.0 - qab * x / qap
+    d = 1.0 / (d if abs(d) > 1e-300 else 1e-300)
+    h = d
+    for m in range(1, 201):
+        m2 = 2 * m
+        for aa in (m * (b - m) * x / ((qam + m2) * (a + m2)),
+                   -(a + m) * (qab + m) * x / ((a + m2) * (qap + m2))):
+            d = 1.0 + aa * d
+            d = 1.0 / (d if abs(d) > 1e-300 else 1e-300)
+            c = 1.0 + aa / c
+            c = c if abs(c) > 1e-300 else 1e-300
+            delta = d * c
+            h *= delta
+        if abs(delta - 1.0) < 3e-14:
+            break
+    return h
+
+
+def _betai(a, b, x):
+    """Regularized incomplete beta function I_x(a, b)."""
+    if x <= 0.0:
+        return 0.0
+    if x >= 1.0:
+        return 1.0
+    bt = math.exp(math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b) + a * math.log(x) + b * math.log(1.0 - x))
+    if x < (a + 1.0) / (a + b + 2.0):
+        return bt * _betacf(a, b, x) / a
+    return 1.0 - bt * _betacf(b, a, 1.0 - x) / b
+
+
+def ttest_pvalue(left, right):
+    """Two-sided Welch t-test p-value for a difference of means."""
+    n1, n2 = len(left), len(right)
+    v1, v2 = left.var(ddof=1) / n1, right.var(ddof=1) / n2
+    diff = right.mean() - left.mean()
+    if v1 + v2 == 0:
+        return 0.0 if diff != 0 else 1.0
+    t = diff / math.sqrt(v1 + v2)
+    df = (v1 + v2) ** 2 / (v1 ** 2 / (n1 - 1) + v2 ** 2 / (n2 - 1))
+    return _betai(df / 2.0, 0.5, df / (df + t * t))
+
+
+def _best_split(x):
+    """Split index maximising the E-divisive (alpha=1) divergence of x[:tau] and x[tau:]."""
+    n = len(x)
+    D = np.abs(x[:, None] - x[None, :])
+    P = np.zeros((n + 1, n + 1))
+    P[1:, 1:] = D.cumsum(0).cumsum(1)
+    tau = np.arange(MIN_SEGMENT, n - MIN_SEGMENT + 1)
+    L, R = tau.astype(float), (n - tau).astype(float)
+    within_left = P[tau, tau] / 2
+    cross = P[tau, n] - P[tau, tau]
+    within_right = (P[n, n] - P[tau, n] - P[n, tau] + P[tau, tau]) / 2
+    e = 2 * cross / (L * R) - within_left / (L * (L - 1) / 2) - within_right / (R * (R - 1) / 2)
+    q = L * R / n * e
+    best = int(np.argmax(q))
+    return int(tau[best]), float(q[best])
+
+
+def _candidate(x):
+    if len(x) <= MAX_WINDOW:
+        return _best_split(x)[0]
+    best_tau, best_q = None, -np.inf
+    for start in range(0, len(x) - MAX_WINDOW // 2, MAX_WINDOW // 2):
+        window = x[start:start + MAX_WINDOW]
+        if len(window) < 2 * MIN_SEGMENT:
+            break
+        tau, q = _best_split(window)
+        if q > best_q:
+            best_tau, best_q = start + tau, q
+    return best_tau
+
+
+def change_points(values, threshold=0.0, max_pvalue=MAX_PVALUE):
+    """Indexes at which the mean of values shifts significantly, found by recursive E-divisive splitting.
+
+    A split is kept when the Welch t-test p-value is below max_pvalue and the
+    relative change of the mean is at least threshold.
+    """
+    x = np.asarray(values, dtype="float64")
+    found = []
+    segments = [(0, len(x))]
+    while segments:
+        a, b = segments.pop()
+        if b - a < 2 * MIN_SEGMENT:
+            continue
+        tau = a + _candidate(x[a:b])
+        left, right = x[a:tau], x[tau:b]
+        before, after = left.mean(), right.mean()
+        magnitude = abs(after - before) / abs(before) if before else math.inf
+        if ttest_pvalue(left, right) >= max_pvalue or magnitude < threshold:
+            continue
+        found.append(tau)
+        segments.extend([(a, tau), (tau, b)])
+    return sorted(found)
+
+
+def _epoch_seconds(column):
+    stamps = pd.to_datetime(column, utc=True)
+    return ((stamps - pd.Timestamp(0, tz="UTC")) // pd.Timedelta(seconds=1)).astype("int64")
+
+
+def analyze_test(frame, test_config):
+    """Change points of one otava test, in the shape of `otava analyze --output json`."""
+    time_column = test_config.get("time_column", "time")
+    attributes = test_config.get("attributes", [])
+    frame = frame.dropna(subset=[time_column]).sort_values(time_column, kind="mergesort").reset_index(drop=True)
+    times = _epoch_seconds(frame[time_column])
+
+    grouped = {}
+    for metric, opts in metric_options(test_config["metrics"]).items():
+        if metric not in frame.columns:
+            continue
+        series = pd.to_numeric(frame[metric], errors="coerce").dropna()
+        values = series.to_numpy()
+        bounds = [0] + change_points(values, opts["threshold"]) + [len(values)]
+        for i in range(1, len(bounds) - 1):
+            before = values[bounds[i - 1]:bounds[i]]
+            after = values[bounds[i]:bounds[i + 1]]
+            row = series.index[bounds[i]]
+            mean_before, mean_after = float(before.mean()), float(after.mean())
+            grouped.setdefault(row, []).append({
+                "metric": metric,
+                "forward_change_percent": (mean_after - mean_before) / mean_before * 100 if mean_before else math.inf,
+                "mean_before": mean_before,
+                "mean_after": mean_after,
+                "stddev_before": float(before.std()),
+                "stddev_after": float(after.std()),
+                "pvalue": ttest_pvalue(before, after),
+                "direction": opts["direction"],
+            })
+
+    return [
+        {
+            "time": int(times[row]),
+            "attributes": {a: str(frame.at[row, a]) for a in attributes if a in frame.columns},
+            "changes": grouped[row],
+        }
+        for row in sorted(grouped)
+    ]
+
+
+def analyze_config(config_path, tests, frames=None):
+    """Run every test of an otava config in-process.
+
+    frames maps a test's `file` path to the DataFrame that was exported there;
+    tests without an in-memory frame are read from their CSV file.
+    """
+    config = load_config(config_path)
+    result = {}
+    for test in tests:
+        test_config = config[test]
+        path = test_config["file"]
+        if frames and path in frames:
+            frame = frames[path]
+        elif os.path.exists(path):
+            frame = pd.read_csv(path)
+        else:
+            # nothing was exported for this test, e.g. no runs in the analysis window
+            result[test] = []
+            continue
+        result[test] = analyze_test(frame, test_config)
+    return result
+
+
+def is_regression(change):
+    # direction 1: higher is better; direction -1: lower is better
+    return (change["mean_after"] - change["mean_before"]) * change["direction"] < 0
+
+
+def format_regressions(change_points):
+    """Render change points like `otava analyze --output regressions_only`."""
+    regressions = []
+    for cp in change_points:
+        changes = [c for c in cp["changes"] if is_regression(c)]
+        if changes:
+            regressions.append((cp["time"], changes))
+    if not regressions:
+        return "No regressions found!"
+    lines = [f"Regressions in {len(regressions)} change points found:"]
+    for time, changes in regressions:
+        stamp = pd.Timestamp(time, unit="s", tz="UTC").strftime("%Y-%m-%d %H:%M:%S %z")
+        lines.append(f"    {stamp}")
+        for c in changes:
+            lines.append(
+                f"        {c['metric']:>20}: {c['mean_before']:>12.2f} --> {c['mean_after']:>12.2f}"
+                f" ({c['forward_change_percent']:+7.1f}%)"
+            )
+    return "\n".join(lines)
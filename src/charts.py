@@ -0,0 +1,46 @@
+import time
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+from src import pool
+from src import downsample
+
+
+def draw_by_platform(item, image_folder, series):
+    """series maps a platform to its (timestamps, values) arrays."""
+    plt.figure(figsize=(8, 5), dpi=150)
+    for key, (timestamps, values) in series.items():
+        plt.plot(*downsample.downsample(timestamps, values), label=key)
+
+    plt.title(f"{item} over Time")
+    plt.xlabel("Time")
+    plt.ylabel("Value")
+    plt.legend()
+    plt.tight_layout()
+    plt.savefig(f"{image_folder}/{item}.png")
+    plt.close()
+
+
+def _timed(func, name, args):
+    started = time.perf_counter()
+    func(*args)
+    return name, time.perf_counter() - started
+
+
+def render_charts(jobs, max_workers=None):
+    """Render independent charts, each job being (name, func, args), in a process pool.
+
+    matplotlib is not thread-safe, so charts are drawn in worker processes
+    started from a fork server; with a single worker they are drawn in this
+    process. Returns (name, seconds) per job.
+    """
+    workers = min(max_workers or pool.default_workers("CHART_WORKERS"), len(jobs)) or 1
+    if workers == 1:
+        timings = [_timed(func, name, args) for name, func, args in jobs]
+    else:
+        with pool.process_pool(workers) as executor:
+            futures = [executor.submit(_timed, func, name, args) for name, func, args in jobs]
+            timings = [f.result() for f in futures]
+    for name, seconds in timings:
+        print(f"chart {name} rendered in {seconds:.2f}s")
+    return timings
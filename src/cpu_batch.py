@@ -0,0 +1,134 @@
+"""Recompute the CPU-derived metrics from raw test-result folders.
+
+    python3 -m src.cpu_batch <results root> [-o cpu_metrics.parquet] [--workers N]
+                             [--phase "cpu-Start=crc start,crc started" ...]
+
+Every folder below the root holding a cpu-consume.txt is parsed in a worker
+process; the samples between the start and stop events of time-stamp.txt give
+the cpu-Start and cpu-Stop metrics, one row per folder, with the same
+"cpu-Start.max" style columns the ingestion flattens from OpenSearch.
+"""
+import os
+import argparse
+import functools
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from src import cpu_trace
+from src import ingest
+from src import pool
+
+# event labels of time-stamp.txt opening and closing each phase, overridable with --phase
+PHASES = {
+    "cpu-Start": ("crc start", "crc started"),
+    "cpu-Stop": ("crc stop", "crc stopped"),
+}
+SPIKE_THRESHOLD = 80.0
+# share of samples above (gt_) or below (lt_) each threshold
+HIGH_THRESHOLDS = {"gt_80": 80.0}
+LOW_THRESHOLDS = {"lt_20": 20.0, "lt_10": 10.0}
+
+
+def phase_bounds(event_seconds, labels, phases=PHASES):
+    """(first, last) second of every phase whose opening and closing events are both present."""
+    bounds = {}
+    for item, (opening, closing) in phases.items():
+        if opening in labels and closing in labels:
+            bounds[item] = (event_seconds[labels.index(opening)], event_seconds[labels.index(closing)])
+    return bounds
+
+
+def window_metrics(percent):
+    """The derived metrics of one phase's samples, percentages for the gt/lt shares."""
+    if not len(percent):
+        return dict.fromkeys(ingest.CPU_METRICS, np.nan)
+    high = percent > SPIKE_THRESHOLD
+    metrics = {
+        "max": percent.max(),
+        "Min": percent.min(),
+        "Mean": percent.mean(),
+        "P95": np.percentile(percent, 95),
+        "Std": percent.std(),
+        # a spike is a run of consecutive samples above the threshold
+        "Spike Count": np.count_nonzero(high[1:] & ~high[:-1]) + int(high[0]),
+    }
+    for name, threshold in HIGH_THRESHOLDS.items():
+        metrics[name] = np.count_nonzero(percent > threshold) * 100.0 / len(percent)
+    for name, threshold in LOW_THRESHOLDS.items():
+        metrics[name] = np.count_nonzero(percent < threshold) * 100.0 / len(percent)
+    return {metric: float(metrics[metric]) for metric in ingest.CPU_METRICS}
+
+
+def analyze_folder(folder, phases=PHASES):
+    """One row of derived metrics for a test-result folder."""
+    trace = cpu_trace.load_trace_folder(folder)
+    seconds, percent = trace["seconds"], trace["percent"]
+    row = {"folder": folder, "samples": len(seconds)}
+    bounds = phase_bounds(trace["event_seconds"], trace["event_labels"], phases)
+    missing = [item for item in phases if item not in bounds]
+    if missing:
+        print(f"⚠️ {folder}: no events for {', '.join(missing)} in time-stamp.txt, their metrics are empty")
+    for item in phases:
+        if item in bounds and len(seconds):
+            # samples are in time order, so each phase is one contiguous slice
+            start, stop = bounds[item]
+            first = np.searchsorted(seconds, start, side="left")
+            last = np.searchsorted(seconds, stop, side="right")
+            metrics = window_metrics(percent[first:last])
+        else:
+            metrics = dict.fromkeys(ingest.CPU_METRICS, np.nan)
+        row.update({f"{item}.{metric}": value for metric, value in metrics.items()})
+    return row
+
+
+def find_trace_folders(root):
+    return sorted(dirpath for dirpath, _, files in os.walk(root) if "cpu-consume.txt" in files)
+
+
+def parse_phase(text):
+    """A --phase value "name=opening label,closing label" as (name, (opening, closing))."""
+    name, _, labels = text.partition("=")
+    opening, _, closing = labels.partition(",")
+    if not name or not opening or not closing:
+        raise argparse.ArgumentTypeError(f"expected name=opening label,closing label, got {text!r}")
+    return name.strip(), (opening.strip(), closing.strip())
+
+
+def analyze_tree(root, max_workers=None, phases=PHASES):
+    """Derived metrics of every trace folder below root, as one frame with a row per folder."""
+    folders = find_trace_folders(root)
+    analyze = functools.partial(analyze_folder, phases=phases)
+    workers = min(max_workers or pool.default_workers("CPU_BATCH_WORKERS"), len(folders)) or 1
+    if workers == 1:
+        rows = [analyze(folder) for folder in folders]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            rows = list(executor.map(analyze, folders, chunksize=max(1, len(folders) // (workers * 4))))
+    frame = pd.DataFrame(rows, columns=["folder", "samples"] + [
+        f"{item}.{metric}" for item in phases for metric in ingest.CPU_METRICS
+    ])
+    frame["folder"] = [os.path.relpath(folder, root) for folder in frame["folder"]]
+    return frame
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("root", help="directory tree of test-result folders")
+    parser.add_argument("-o", "--output", default="cpu_metrics.parquet", help=".parquet or .csv table to write")
+    parser.add_argument("--workers", type=int, help="worker processes, defaults to the container CPU limit")
+    parser.add_argument("--phase", type=parse_phase, action="append",
+                        help="a phase and the time-stamp.txt labels opening and closing it, as "
+                             "name=opening,closing; repeat per phase (default: %s)"
+                             % "; ".join(f"{k}={a},{b}" for k, (a, b) in PHASES.items()))
+    args = parser.parse_args()
+
+    frame = analyze_tree(args.root, args.workers, dict(args.phase) if args.phase else PHASES)
+    if args.output.endswith(".csv"):
+        frame.to_csv(args.output, index=False)
+    else:
+        frame.to_parquet(args.output, index=False)
+    print(f"✅ CPU metrics of {len(frame)} runs saved: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,10 @@
-import re
 import os
-from datetime import datetime
+import matplotlib
+matplotlib.use("Agg")
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
+from src import downsample
+from src import cpu_trace
 
 def generate_cpu_chart_from_files(cpu_file_path, event_file_path, platform, image_path):
     """
@@ -11,47 +13,23 @@ def generate_cpu_chart_from_files(cpu_file_path, event_file_path, platform, imag
         event_file_path (str): event time stamp TXT file path
         image_path (str): the output filename
     """
-    timestamps = []
-    cpu_percents = []
-    event_data = []
-
     # --- 1. read and analyze cpu data file ---
-    cpu_pattern = re.compile(r'\[(\d{2}:\d{2}:\d{2})\], cpu percent: ([\d.]+)\%')
     try:
-        with open(cpu_file_path, 'r') as f:
-            for line in f:
-                match = cpu_pattern.search(line)
-                if match:
-                    time_str = match.group(1)
-                    percent_str = match.group(2)
-                    
-                    try:
-                        # 转换时间字符串为 datetime 对象 (只处理 HH:MM:SS)
-                        dt = datetime.strptime(time_str, '%H:%M:%S')
-                        timestamps.append(dt)
-                        cpu_percents.append(float(percent_str))
-                    except ValueError:
-                        # 跳过无效数据行
-                        pass
+        seconds, cpu_percents = cpu_trace.load_cpu_trace(cpu_file_path)
     except FileNotFoundError:
         print(f"错误: 找不到 CPU 数据文件 {cpu_file_path}")
         return
 
-    if not timestamps:
+    if not len(seconds):
         print("错误: CPU 数据文件中没有找到有效数据来绘图。")
         return
+    timestamps = cpu_trace.to_datetime64(seconds)
 
     # --- 2. read and analyze event time stamp ---
-    event_pattern = re.compile(r'\[(\d{2}:\d{2}:\d{2})\], (.+)')
+    event_data = []
     try:
-        with open(event_file_path, 'r') as f:
-            for line in f:
-                match = event_pattern.search(line)
-                if match:
-                    # 提取 HH:MM:SS 和事件标签
-                    time_str = match.group(1).strip()
-                    label = match.group(2).strip()
-                    event_data.append((time_str, label))
+        event_seconds, labels = cpu_trace.load_events(event_file_path, seconds[0])
+        event_data = list(zip(cpu_trace.to_datetime64(event_seconds).tolist(), labels))
     except FileNotFoundError:
         print(f"警告: 找不到事件文件 {event_file_path}，将只绘制 CPU 曲线，不添加事件线。")
     
@@ -61,17 +39,16 @@ def generate_cpu_chart_from_files(cpu_file_path, event_file_path, platform, imag
     fig, ax = plt.subplots(figsize=(12, 7))
 
     # 4. draw CPU 
-    max_cpu = max(cpu_percents) if cpu_percents else 100
-    ax.plot(timestamps, cpu_percents, marker='o', linestyle='-', color='blue', label='CPU Usage', zorder=1)
+    max_cpu = cpu_percents.max()
+    # min/max decimation keeps every spike visible while bounding the number of markers
+    plot_times, plot_percents = downsample.downsample(timestamps, cpu_percents, method="minmax")
+    ax.plot(plot_times, plot_percents, marker='o', linestyle='-', color='blue', label='CPU Usage', zorder=1)
 
     # 5. add even vertical line and tag
     if event_data:
         y_text_pos = max_cpu * 1.05
         
-        for time_str, label in event_data:
-            # 将事件时间转换为 datetime 对象，用于与 X 轴时间匹配
-            event_dt = datetime.strptime(time_str, '%H:%M:%S')
-            
+        for event_dt, label in event_data:
             # 绘制垂直线
             ax.axvline(
                 x=event_dt, 
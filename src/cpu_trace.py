@@ -0,0 +1,84 @@
+import io
+import os
+import itertools
+import numpy as np
+
+SECONDS_PER_DAY = 24 * 3600
+CHUNK_LINES = 100000
+
+CPU_PATTERN = r'\[(\d{2}):(\d{2}):(\d{2})\], cpu percent: (\d+(?:\.\d*)?)%'
+CPU_DTYPE = [("h", "i4"), ("m", "i4"), ("s", "i4"), ("percent", "f8")]
+EVENT_PATTERN = r'\[(\d{2}):(\d{2}):(\d{2})\], ([^\r\n]+)'
+EVENT_DTYPE = [("h", "i4"), ("m", "i4"), ("s", "i4"), ("label", "U256")]
+
+
+def _seconds_of_day(rows):
+    valid = (rows["h"] < 24) & (rows["m"] < 60) & (rows["s"] < 60)
+    rows = rows[valid]
+    return rows, rows["h"] * 3600 + rows["m"] * 60 + rows["s"]
+
+
+def _unwrap(seconds, previous, day_offset):
+    """Add a day every time the clock goes backwards, continuing from the previous chunk."""
+    if not len(seconds):
+        return seconds.astype("int64"), previous, day_offset
+    steps = np.diff(seconds, prepend=seconds[0] if previous is None else previous)
+    days = day_offset + np.cumsum(steps < 0)
+    return seconds + days * SECONDS_PER_DAY, int(seconds[-1]), int(days[-1])
+
+
+def _chunks(f, chunk_lines):
+    while True:
+        lines = list(itertools.islice(f, chunk_lines))
+        if not lines:
+            return
+        yield io.StringIO("".join(lines))
+
+
+def load_cpu_trace(path, chunk_lines=CHUNK_LINES):
+    """Parse a cpu-consume.txt file into (seconds, percent) NumPy arrays.
+
+    seconds counts from midnight of the first sample's day and keeps growing past
+    midnight; lines that do not match the expected format are skipped.
+    """
+    seconds, percents = [], []
+    previous, day_offset = None, 0
+    with open(path, "r") as f:
+        for chunk in _chunks(f, chunk_lines):
+            rows, secs = _seconds_of_day(np.fromregex(chunk, CPU_PATTERN, CPU_DTYPE))
+            secs, previous, day_offset = _unwrap(secs.astype("int64"), previous, day_offset)
+            seconds.append(secs)
+            percents.append(rows["percent"])
+    if not seconds:
+        return np.empty(0, dtype="int64"), np.empty(0, dtype="float64")
+    return np.concatenate(seconds), np.concatenate(percents)
+
+
+def load_events(path, start=None):
+    """Parse a time-stamp.txt file into (seconds, labels).
+
+    Events are unwrapped past midnight like the CPU samples; when start (the
+    first CPU sample) is given, events on the following day are shifted so both
+    series share the same clock.
+    """
+    with open(path, "r") as f:
+        rows, secs = _seconds_of_day(np.fromregex(f, EVENT_PATTERN, EVENT_DTYPE))
+    secs, _, _ = _unwrap(secs.astype("int64"), None, 0)
+    if start is not None and len(secs) and secs[0] < start - SECONDS_PER_DAY // 2:
+        secs = secs + SECONDS_PER_DAY
+    return secs, [label.strip() for label in rows["label"]]
+
+
+def to_datetime64(seconds, day="1900-01-01"):
+    return np.datetime64(day, "s") + seconds.astype("timedelta64[s]")
+
+
+def load_trace_folder(folder):
+    """Parsed cpu-consume.txt and time-stamp.txt of one test-result folder."""
+    seconds, percent = load_cpu_trace(os.path.join(folder, "cpu-consume.txt"))
+    event_path = os.path.join(folder, "time-stamp.txt")
+    if os.path.exists(event_path):
+        event_seconds, labels = load_events(event_path, seconds[0] if len(seconds) else None)
+    else:
+        event_seconds, labels = np.empty(0, dtype="int64"), []
+    return {"seconds": seconds, "percent": percent, "event_seconds": event_seconds, "event_labels": labels}
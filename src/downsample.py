@@ -0,0 +1,60 @@
+import os
+import numpy as np
+
+MAX_POINTS = int(os.environ.get("CHART_MAX_POINTS", "1000"))
+METHOD = os.environ.get("CHART_DOWNSAMPLE", "lttb")
+
+
+def _as_float(x):
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        return x.astype("datetime64[ns]").astype("int64").astype("float64")
+    return x.astype("float64")
+
+
+def lttb_indices(x, y, n):
+    """Indexes kept by Largest-Triangle-Three-Buckets: first, last and one point per bucket."""
+    length = len(y)
+    if n >= length or n < 3:
+        return np.arange(length)
+    edges = np.linspace(1, length - 1, n - 1).astype(int)
+    keep = np.empty(n, dtype=int)
+    keep[0], keep[-1] = 0, length - 1
+    a = 0
+    for i in range(n - 2):
+        start, stop = edges[i], edges[i + 1]
+        nxt_start, nxt_stop = edges[i + 1], edges[i + 2] if i + 2 < len(edges) else length
+        avg_x = x[nxt_start:nxt_stop].mean() if nxt_stop > nxt_start else x[-1]
+        avg_y = y[nxt_start:nxt_stop].mean() if nxt_stop > nxt_start else y[-1]
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:stop] - y[a]) - (x[a] - x[start:stop]) * (avg_y - y[a])
+        )
+        a = start + int(np.argmax(area))
+        keep[i + 1] = a
+    return keep
+
+
+def minmax_indices(y, n):
+    """Indexes of the minimum and maximum of each of n/2 buckets, so every spike survives."""
+    length = len(y)
+    if n >= length or n < 2:
+        return np.arange(length)
+    keep = []
+    for bucket in np.array_split(np.arange(length), n // 2):
+        values = y[bucket]
+        keep.extend((bucket[np.argmin(values)], bucket[np.argmax(values)]))
+    return np.unique(keep)
+
+
+def downsample(x, y, n=MAX_POINTS, method=METHOD):
+    """Reduce the series (x, y) to about n points before plotting; short series are returned as is."""
+    x, y = np.asarray(x), np.asarray(y, dtype="float64")
+    if len(y) <= n:
+        return x, y
+    valid = ~np.isnan(y)
+    x, y = x[valid], y[valid]
+    if method == "minmax":
+        keep = minmax_indices(y, n)
+    else:
+        keep = lttb_indices(_as_float(x), y, n)
+    return x[keep], y[keep]
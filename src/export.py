@@ -0,0 +1,24 @@
+import os
+
+DATASET_NAME = "dataset"
+
+
+def partition_path(folder, family, platform):
+    return os.path.join(folder, DATASET_NAME, f"family={family}", f"platform={platform}", "part-0.parquet")
+
+
+def write_partition(frame, folder, family, platform):
+    """Write one platform/metric-family slice of the columnar export dataset.
+
+    bundle is stored as a dictionary-encoded column and the file is zstd
+    compressed. Each family has its own columns, so read it back per family,
+    e.g. pd.read_parquet(f"{folder}/{DATASET_NAME}/family=time"), which adds
+    platform as a partition column.
+    """
+    path = partition_path(folder, family, platform)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    frame = frame.drop(columns=["platform"], errors="ignore")
+    frame.assign(bundle=frame["bundle"].astype("category")).to_parquet(
+        path, index=False, compression="zstd"
+    )
+    return path
@@ -0,0 +1,384 @@
+import os
+import json
+import itertools
+import functools
+import numpy as np
+import pandas as pd
+
+INDEX_NAME = "crc-test"
+PAGE_SIZE = int(os.environ.get("OPENSEARCH_PAGE_SIZE", "1000"))
+SCROLL_KEEP_ALIVE = "2m"
+# rows buffered as Python values before they are converted to a typed chunk
+CHUNK_ROWS = int(os.environ.get("INGEST_CHUNK_ROWS", "5000"))
+
+PLATFORM_MAP = {
+    "openshift-darwin-amd64": "darwin-amd64",
+    "openshift-darwin-arm64": "darwin-arm64",
+    "openshift-linux-amd64": "linux-amd64",
+    "openshift-linux-arm64": "linux-arm64",
+    "openshift-windows-amd64": "windows-amd64",
+}
+
+# only the fields the report uses are pulled from _source
+SOURCE_FIELDS = [
+    "category",
+    "bundle",
+    "timestamp",
+    "time-start",
+    "time-stop",
+    "memory-start",
+    "memory-deployment",
+    "memory-stop",
+    "cpu-Start.derived",
+    "cpu-Stop.derived",
+]
+
+TIME_METRICS = ["time-start", "time-stop"]
+MEMORY_METRICS = ["memory-start", "memory-deployment", "memory-stop"]
+# float32 keeps ~7 significant digits, enough below this magnitude for seconds, MiB and CPU percentages
+FLOAT32_MAX_SAFE = 1e7
+
+CPU_ITEMS = ("cpu-Start", "cpu-Stop")
+CPU_METRICS = ["max", "Min", "Mean", "P95", "Std", "Spike Count", "gt_80", "lt_20", "lt_10"]
+
+
+class ColumnBuffer:
+    """Append-only column store for one platform, padded so every column has one value per row.
+
+    Rows are held as Python values only until chunk_rows have arrived; each such
+    chunk is then converted to a typed frame by apply_schema, so memory grows with
+    the compact frames rather than with boxed cells.
+    """
+
+    def __init__(self, chunk_rows=CHUNK_ROWS):
+        self.rows = 0
+        self.chunk_rows = chunk_rows
+        self.chunks = []
+        self.columns = {}
+        self.pending = 0
+
+    def append(self, record):
+        for name, value in record.items():
+            column = self.columns.get(name)
+            if column is None:
+                column = self.columns[name] = [None] * self.pending
+            column.append(value)
+        self.rows += 1
+        self.pending += 1
+        for column in self.columns.values():
+            if len(column) < self.pending:
+                column.append(None)
+        if self.pending >= self.chunk_rows:
+            self.flush()
+
+    def flush(self):
+        if self.pending:
+            self.chunks.append(apply_schema(pd.DataFrame(self.columns)))
+            self.columns, self.pending = {}, 0
+
+    def to_frame(self):
+        self.flush()
+        chunks, self.chunks = self.chunks, []
+        if len(chunks) == 1:
+            return chunks[0]
+        # chunks disagree on categories and float widths, so the schema is applied again to the whole
+        return apply_schema(pd.concat(chunks, ignore_index=True))
+
+
+def flatten_nested(obj):
+    items = []
+    if isinstance(obj, dict):
+        for k, v in obj.items():
+            new_key = k
+            if isinstance(v, (dict, list)):
+                items.extend(flatten_nested(v).items())
+            else:
+                items.append((new_key, v))
+    elif isinstance(obj, list):
+        for i, v in enumerate(obj):
+            new_key =  str(i)
+            if isinstance(v, (dict, list)):
+                items.extend(flatten_nested(v).items())
+            else:
+                items.append((new_key, v))
+    return dict(items)
+
+
+def extract_cpu_derived(record):
+    """Replace the nested cpu-Start/cpu-Stop blobs of a record by flat "<item>.<metric>" columns."""
+    for item in CPU_ITEMS:
+        blob = record.pop(item, None)
+        if not isinstance(blob, dict) or "derived" not in blob:
+            continue
+        derived = blob["derived"]
+        for metric in CPU_METRICS:
+            record[f"{item}.{metric}"] = derived.get(metric)
+        unknown = {k: v for k, v in derived.items() if k not in CPU_METRICS}
+        if unknown:
+            for k, v in flatten_nested(unknown).items():
+                record[f"{item}.{k}"] = v
+    return record
+
+
+def apply_schema(frame):
+    """Coerce a platform frame to its compact in-memory types; safe to call repeatedly."""
+    frame["category"] = frame["category"].astype("category")
+    frame["bundle"] = frame["bundle"].astype("category")
+    if not pd.api.types.is_datetime64_dtype(frame["timestamp"]):
+        # parsed once here, as naive UTC, for every later stage
+        frame["timestamp"] = pd.to_datetime(frame["timestamp"], utc=True, format="ISO8601").dt.tz_localize(None)
+    cpu_columns = [f"{item}.{metric}" for item in CPU_ITEMS for metric in CPU_METRICS]
+    for metric in TIME_METRICS + MEMORY_METRICS + cpu_columns:
+        if metric not in frame.columns:
+            continue
+        values = pd.to_numeric(frame[metric], errors="coerce")
+        if values.abs().max() < FLOAT32_MAX_SAFE:
+            values = values.astype("float32")
+        frame[metric] = values
+    return frame
+
+
+def memory_footprint(Platform_DATA):
+    return sum(int(v.memory_usage(deep=True).sum()) for v in Platform_DATA.values())
+
+
+def since_filter(since):
+    # gte rather than gt: documents sharing the last timestamp are deduplicated by _id
+    return {"range": {"timestamp": {"gte": since}}}
+
+
+def build_query(since=None):
+    """Query of the platforms' documents; since maps a platform to the timestamp its documents are fetched from.
+
+    Each platform has its own lower bound, so a result indexed late is still
+    fetched after newer runs of other platforms were cached; platforms missing
+    from since are fetched in full.
+    """
+    since = {platform: stamp for platform, stamp in (since or {}).items() if stamp is not None}
+    if since:
+        filters = [{"bool": {"should": [
+            {"bool": {"filter": [{"term": {"category.keyword": category}}]
+                      + ([since_filter(since[platform])] if platform in since else [])}}
+            for category, platform in PLATFORM_MAP.items()
+        ], "minimum_should_match": 1}}]
+    else:
+        filters = [{"terms": {"category.keyword": list(PLATFORM_MAP)}}]
+    return {
+        "_source": {"includes": SOURCE_FIELDS},
+        "sort": ["_doc"],
+        "query": {"bool": {"filter": filters}},
+    }
+
+
+def scroll_pages(client, index, query, page_size=PAGE_SIZE):
+    response = client.search(index=index, body=query, size=page_size, scroll=SCROLL_KEEP_ALIVE)
+    scroll_id = response.get("_scroll_id")
+    try:
+        while True:
+            hits = response["hits"]["hits"]
+            if not hits:
+                break
+            yield hits
+            if len(hits) < page_size:
+                break
+            response = client.scroll(scroll_id=scroll_id, scroll=SCROLL_KEEP_ALIVE)
+            scroll_id = response.get("_scroll_id", scroll_id)
+    finally:
+        if scroll_id:
+            client.clear_scroll(scroll_id=scroll_id)
+
+
+def load_platform_data(client, index=INDEX_NAME, since=None, page_size=PAGE_SIZE):
+    buffers = {platform: ColumnBuffer() for platform in PLATFORM_MAP.values()}
+    total = 0
+    for hits in scroll_pages(client, index, build_query(since), page_size):
+        for hit in hits:
+            source = hit["_source"]
+            platform = PLATFORM_MAP.get(source.get("category"))
+            if platform is None:
+                continue
+            buffers[platform].append(extract_cpu_derived({"_id": hit["_id"], **source}))
+            total += 1
+    print(f"Total {total} records")
+
+    Platform_DATA = {}
+    for platform, buffer in buffers.items():
+        if buffer.rows == 0:
+            continue
+        Platform_DATA[platform] = buffer.to_frame()
+    return Platform_DATA
+
+
+class ReplayClient:
+    """Local stand-in for the OpenSearch client that replays recorded hits.
+
+    hits is the path of a JSON file holding a search response or a list of hits,
+    or the list itself. Supports the subset of the API used by this module: ping,
+    search with the per-platform category/timestamp filters and _source includes of
+    build_query, scroll and clear_scroll, plus the composite aggregations of
+    src/pushdown.py and the terms aggregation of src/async_ingest.py.
+    """
+
+    def __init__(self, hits):
+        if isinstance(hits, (str, os.PathLike)):
+            with open(hits, encoding="utf-8") as f:
+                hits = json.load(f)
+        self.hits = hits["hits"]["hits"] if isinstance(hits, dict) else hits
+        self._scrolls = {}
+        self._scroll_ids = itertools.count()
+
+    def ping(self):
+        return True
+
+    def search(self, index=None, body=None, size=10, scroll=None, **kwargs):
+        body = body or {}
+        if "aggs" in body:
+            sources = [hit["_source"] for hit in self.hits if _matches(hit["_source"], body.get("query"))]
+            return {
+                "hits": {"total": {"value": len(sources)}, "hits": []},
+                "aggregations": {name: _bucket_agg(sources, agg) for name, agg in body["aggs"].items()},
+            }
+        hits = [
+            {"_id": hit["_id"], "_source": _project(hit["_source"], body.get("_source"))}
+            for hit in self.hits
+            if _matches(hit["_source"], body.get("query"))
+        ]
+        scroll_id = str(next(self._scroll_ids))
+        self._scrolls[scroll_id] = (hits, size, size)
+        return {"_scroll_id": scroll_id, "hits": {"total": {"value": len(hits)}, "hits": hits[:size]}}
+
+    def scroll(self, scroll_id=None, scroll=None, **kwargs):
+        hits, size, offset = self._scrolls[scroll_id]
+        self._scrolls[scroll_id] = (hits, size, offset + size)
+        return {"_scroll_id": scroll_id, "hits": {"hits": hits[offset:offset + size]}}
+
+    def clear_scroll(self, scroll_id=None, **kwargs):
+        self._scrolls.pop(scroll_id, None)
+
+
+def _matches(source, query):
+    if not query:
+        return True
+    clauses = query.get("bool", {})
+    if not all(_matches_clause(source, clause) for clause in clauses.get("filter", [])):
+        return False
+    should = clauses.get("should")
+    return not should or any(_matches_clause(source, clause) for clause in should)
+
+
+def _matches_clause(source, clause):
+    if "bool" in clause:
+        return _matches(source, clause)
+    if "term" in clause or "terms" in clause:
+        field, values = next(iter(clause.get("terms", clause.get("term")).items()))
+        values = values if "terms" in clause else [values]
+        return source.get(field.replace(".keyword", "")) in values
+    if "range" in clause:
+        field, bounds = next(iter(clause["range"].items()))
+        value = source.get(field)
+        if value is None:
+            return False
+        value = _utc(value)
+        bounds = {op: _utc(bound) for op, bound in bounds.items()}
+        if "gte" in bounds and not value >= bounds["gte"]:
+            return False
+        if "gt" in bounds and not value > bounds["gt"]:
+            return False
+        if "lt" in bounds and not value < bounds["lt"]:
+            return False
+    return True
+
+
+def _bucket_agg(sources, agg):
+    if "composite" in agg:
+        return _composite(sources, agg)
+    if "terms" in agg:
+        return _terms(sources, agg)
+    raise ValueError(f"unsupported aggregation {next(iter(agg))}")
+
+
+def _terms(sources, agg):
+    field = agg["terms"]["field"].replace(".keyword", "")
+    groups = {}
+    for source in sources:
+        if source.get(field) is not None:
+            groups.setdefault(source[field], []).append(source)
+    ranked = sorted(groups.items(), key=lambda item: (-len(item[1]), item[0]))[:agg["terms"].get("size", 10)]
+    buckets = []
+    for key, members in ranked:
+        bucket = {"key": key, "doc_count": len(members)}
+        for name, sub in agg.get("aggs", {}).items():
+            kind, spec = next(iter(sub.items()))
+            bucket[name] = _metric_agg(kind, spec, [m[spec["field"]] for m in members if m.get(spec["field"]) is not None])
+        buckets.append(bucket)
+    return {"buckets": buckets}
+
+
+def _composite(sources, agg):
+    """Buckets of a composite aggregation with terms sources and extended_stats/percentiles sub-aggregations."""
+    composite = agg["composite"]
+    fields = [(name, spec["terms"]["field"].replace(".keyword", "")) for source in composite["sources"]
+              for name, spec in source.items()]
+    groups = {}
+    for source in sources:
+        key = tuple(source.get(field) for _, field in fields)
+        if None not in key:
+            groups.setdefault(key, []).append(source)
+    keys = sorted(groups)
+    if "after" in composite:
+        after = tuple(composite["after"][name] for name, _ in fields)
+        keys = [key for key in keys if key > after]
+    keys = keys[:composite.get("size", 10)]
+    buckets = []
+    for key in keys:
+        bucket = {"key": {name: value for (name, _), value in zip(fields, key)}, "doc_count": len(groups[key])}
+        for name, sub in agg.get("aggs", {}).items():
+            kind, spec = next(iter(sub.items()))
+            bucket[name] = _metric_agg(kind, spec, [s[spec["field"]] for s in groups[key] if s.get(spec["field"]) is not None])
+        buckets.append(bucket)
+    result = {"buckets": buckets}
+    if buckets:
+        result["after_key"] = buckets[-1]["key"]
+    return result
+
+
+def _metric_agg(kind, spec, values):
+    empty = not len(values)
+    if kind in ("min", "max"):
+        if empty:
+            return {"value": None}
+        # date fields report epoch milliseconds plus the formatted date
+        stamps = [_utc(v) for v in values]
+        stamp = min(stamps) if kind == "min" else max(stamps)
+        return {"value": stamp.value // 10**6, "value_as_string": stamp.strftime("%Y-%m-%dT%H:%M:%S.%fZ")}
+    values = np.asarray(values, dtype=float)
+    if kind == "extended_stats":
+        return {
+            "count": len(values),
+            "avg": None if empty else float(values.mean()),
+            "std_deviation": None if empty else float(values.std()),
+        }
+    if kind == "percentiles":
+        return {"values": {str(float(p)): None if empty else float(np.percentile(values, p)) for p in spec["percents"]}}
+    raise ValueError(f"unsupported aggregation {kind}")
+
+
+@functools.lru_cache(maxsize=65536)
+def _utc(value):
+    stamp = pd.Timestamp(value)
+    return stamp.tz_localize("UTC") if stamp.tzinfo is None else stamp.tz_convert("UTC")
+
+
+def _project(source, includes):
+    if not includes:
+        return source
+    projected = {}
+    for field in includes["includes"]:
+        top, _, sub = field.partition(".")
+        if top not in source:
+            continue
+        if not sub:
+            projected[top] = source[top]
+        elif isinstance(source[top], dict) and sub in source[top]:
+            projected.setdefault(top, {})[sub] = source[top][sub]
+    return projected
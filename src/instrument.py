@@ -0,0 +1,172 @@
+import contextlib
+import functools
+import json
+import resource
+import time
+import threading
+from datetime import datetime, timezone
+
+RECORDS = []
+# stages run concurrently by src/scheduler.py each nest under their own thread's stack
+_LOCAL = threading.local()
+# the kernel keeps one RSS high-water mark per process; every stage restarts it, so the
+# peak reached so far is first folded into the running stages (by id) and into the run
+_PEAKS = {}
+_RUN_PEAK = [0.0]
+_PEAK_LOCK = threading.Lock()
+
+
+def _stack():
+    if not hasattr(_LOCAL, "stack"):
+        _LOCAL.stack = []
+    return _LOCAL.stack
+
+
+def _status_mib(field):
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith(f"{field}:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def _high_water_mib():
+    peak = _status_mib("VmHWM")
+    if peak is None:
+        # ru_maxrss is reported in KiB on Linux
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return peak
+
+
+def _restart_high_water():
+    peak = _high_water_mib()
+    for key in _PEAKS:
+        _PEAKS[key] = max(_PEAKS[key], peak)
+    _RUN_PEAK[0] = max(_RUN_PEAK[0], peak)
+    try:
+        with open("/proc/self/clear_refs", "w", encoding="ascii") as f:
+            f.write("5")
+    except OSError:
+        # without it each stage reports the process high-water mark so far
+        pass
+
+
+def _peak_rss_mib():
+    with _PEAK_LOCK:
+        return max(_RUN_PEAK[0], _high_water_mib())
+
+
+@contextlib.contextmanager
+def stage(name, **tags):
+    """Record wall time, CPU time, peak RSS and RSS growth of a block.
+
+    CPU time is that of the calling thread only, so stages running side by side
+    do not count each other's work; subprocesses report theirs with add(). The
+    yielded dict can be filled with extra fields such as rows; stages opened
+    inside another stage record it as their parent.
+    """
+    record = {"stage": name, **tags}
+    stack = _stack()
+    if stack:
+        record["parent"] = stack[-1]
+    stack.append(name)
+    with _PEAK_LOCK:
+        _restart_high_water()
+        rss = _status_mib("VmRSS") or 0.0
+        _PEAKS[id(record)] = rss
+    wall, cpu = time.perf_counter(), time.thread_time()
+    try:
+        yield record
+    finally:
+        stack.pop()
+        record["wall_seconds"] = round(time.perf_counter() - wall, 4)
+        record["cpu_seconds"] = round(time.thread_time() - cpu, 4)
+        with _PEAK_LOCK:
+            peak = max(_PEAKS.pop(id(record)), _high_water_mib())
+            _RUN_PEAK[0] = max(_RUN_PEAK[0], peak)
+        record["peak_rss_mib"] = round(peak, 1)
+        record["rss_growth_mib"] = round(peak - rss, 1)
+        RECORDS.append(record)
+
+
+def timed(name=None):
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(name or func.__name__):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def add(name, **fields):
+    """Record a sub-step that was timed elsewhere, e.g. in a worker process or subprocess."""
+    record = {"stage": name, **fields}
+    stack = _stack()
+    if stack:
+        record["parent"] = stack[-1]
+    RECORDS.append(record)
+
+
+def take_records():
+    """Remove and return the records made so far, e.g. in a worker process to hand them to the parent."""
+    records = RECORDS[:]
+    del RECORDS[:]
+    return records
+
+
+def extend(records, parent):
+    """Add records made elsewhere, nesting their top-level ones under parent."""
+    RECORDS.extend(record if "parent" in record else {**record, "parent": parent} for record in records)
+
+
+def save(path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "peak_rss_mib": round(_peak_rss_mib(), 1),
+            "stages": RECORDS,
+        }, f, indent=1)
+
+
+@contextlib.contextmanager
+def profiled(mode, path):
+    """Profile the block with cProfile or pyinstrument when mode is set, writing the dump to path."""
+    if not mode:
+        yield
+        return
+    if mode == "pyinstrument":
+        try:
+            from pyinstrument import Profiler
+        except ImportError:
+            print("⚠️ pyinstrument is not installed, falling back to cProfile.")
+        else:
+            profiler = Profiler()
+            profiler.start()
+            try:
+                yield
+            finally:
+                profiler.stop()
+                with open(f"{path}.html", "w", encoding="utf-8") as f:
+                    f.write(profiler.output_html())
+            return
+    import cProfile
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(f"{path}.pstats")
+
+
+def push(client, index, run_timestamp=None):
+    """Index the top-level stages as documents so the pipeline's own cost becomes a series."""
+    run_timestamp = run_timestamp or datetime.now(timezone.utc).isoformat()
+    for record in RECORDS:
+        if "parent" in record:
+            continue
+        client.index(index=index, body={"timestamp": run_timestamp, **record})
@@ -0,0 +1,182 @@
+"""Content-hashed manifest of the report artifacts.
+
+Every artifact is recorded with a hash of its inputs (frame slice, template
+sources, render context) and of its content. A generator whose inputs match the
+previous run's manifest is skipped, and only the files whose content changed are
+listed in upload-list.txt for the upload step.
+
+The bucket can be stood in for by a local folder:
+
+    python3 -m src.manifest fetch <bucket folder> previous-manifest.json
+    python3 -m src.manifest upload result <bucket folder>
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import hashlib
+import numpy as np
+import pandas as pd
+
+MANIFEST_NAME = "manifest.json"
+UPLOAD_LIST_NAME = "upload-list.txt"
+# the previous run's manifest, e.g. fetched from the bucket; defaults to the one in the result folder
+PREVIOUS_PATH = os.environ.get("MANIFEST_PREVIOUS")
+TEMPLATE_FOLDER = "template"
+# bump when a generator writes something different from the same inputs
+VERSION = "1"
+ENTRIES = {}
+STATE = {"folder": "result", "previous": {}, "remote": False, "started": 0}
+
+
+def load(folder, previous_path=PREVIOUS_PATH):
+    """Start a run writing into folder, comparing against the previous manifest if there is one.
+
+    A manifest fetched from elsewhere describes artifacts already uploaded, so they
+    are skipped even though they are not in folder; the manifest of a local
+    previous run only lets artifacts still on disk be skipped.
+    """
+    remote = bool(previous_path)
+    path = previous_path or os.path.join(folder, MANIFEST_NAME)
+    try:
+        with open(path, encoding="utf-8") as f:
+            previous = json.load(f)["artifacts"]
+    except (FileNotFoundError, ValueError, KeyError):
+        previous = {}
+    ENTRIES.clear()
+    STATE.update(folder=folder, previous=previous, remote=remote, started=time.time_ns())
+    return previous
+
+
+def inputs_hash(*parts):
+    """Hash of the inputs of an artifact: frames, arrays and anything with a stable str()."""
+    digest = hashlib.sha256(VERSION.encode())
+    for part in parts:
+        if isinstance(part, pd.DataFrame):
+            digest.update(json.dumps([str(c) for c in part.columns]).encode())
+            digest.update(pd.util.hash_pandas_object(part, index=False).to_numpy().tobytes())
+        elif isinstance(part, np.ndarray):
+            digest.update(pd.util.hash_array(part.ravel()).tobytes())
+        else:
+            digest.update(str(part).encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def template_hash(folder=TEMPLATE_FOLDER):
+    """Hash of every template source, since the pages include the shared scripts."""
+    digest = hashlib.sha256()
+    for name in sorted(os.listdir(folder)):
+        digest.update(name.encode())
+        digest.update(file_hash(os.path.join(folder, name)).encode())
+    return digest.hexdigest()
+
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(2**20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _name(path):
+    return os.path.relpath(path, STATE["folder"])
+
+
+def unchanged(path, key):
+    """True when path was produced from the same inputs last run, so its generator can be skipped."""
+    name = _name(path)
+    entry = STATE["previous"].get(name)
+    if entry is None or entry.get("inputs") != key:
+        return False
+    if not STATE["remote"] and not os.path.exists(path):
+        return False
+    ENTRIES[name] = dict(entry, skipped=True)
+    return True
+
+
+def record(path, key=None):
+    """Record a freshly written artifact; key is None for those that are always regenerated."""
+    ENTRIES[_name(path)] = {"inputs": key, "sha256": file_hash(path)}
+
+
+def _written_this_run(path):
+    return os.stat(path).st_mtime_ns >= STATE["started"]
+
+
+def discard_stale(path):
+    """Delete path if this run neither wrote nor skipped it, e.g. the export of a platform that left the window."""
+    if os.path.exists(path) and _name(path) not in ENTRIES and not _written_this_run(path):
+        os.remove(path)
+        return True
+    return False
+
+
+def save(folder=None):
+    """Write the manifest and the list of files whose content changed since the previous run.
+
+    Files written this run that no generator recorded (the regression result,
+    the pipeline metrics) are compared by content only; files left over from
+    earlier runs are deleted.
+    """
+    folder = folder or STATE["folder"]
+    removed = 0
+    for dirpath, _, files in os.walk(folder, topdown=False):
+        for file in files:
+            path = os.path.join(dirpath, file)
+            name = _name(path)
+            if name in ENTRIES or name in (MANIFEST_NAME, UPLOAD_LIST_NAME):
+                continue
+            if _written_this_run(path):
+                record(path)
+            else:
+                os.remove(path)
+                removed += 1
+        if dirpath != folder and not os.listdir(dirpath):
+            os.rmdir(dirpath)
+    previous = STATE["previous"]
+    changed = sorted(
+        name for name, entry in ENTRIES.items()
+        if not entry.get("skipped") and previous.get(name, {}).get("sha256") != entry["sha256"]
+    )
+    artifacts = {name: {k: v for k, v in entry.items() if k != "skipped"} for name, entry in sorted(ENTRIES.items())}
+    with open(os.path.join(folder, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump({"version": VERSION, "artifacts": artifacts}, f, indent=1)
+    with open(os.path.join(folder, UPLOAD_LIST_NAME), "w", encoding="utf-8") as f:
+        f.writelines(f"{name}\n" for name in changed)
+    skipped = sum(1 for entry in ENTRIES.values() if entry.get("skipped"))
+    return changed, skipped, removed
+
+
+def fetch(bucket, destination):
+    """Filesystem stand-in for fetching the previous manifest from the bucket."""
+    source = os.path.join(bucket, MANIFEST_NAME)
+    if not os.path.exists(source):
+        print("⚠️ No previous manifest, every artifact is generated and uploaded.")
+        return False
+    shutil.copyfile(source, destination)
+    return True
+
+
+def upload(folder, bucket):
+    """Filesystem stand-in for the upload step: the listed files, then the manifest describing them."""
+    with open(os.path.join(folder, UPLOAD_LIST_NAME), encoding="utf-8") as f:
+        names = [line.strip() for line in f if line.strip()]
+    for name in names + [MANIFEST_NAME]:
+        target = os.path.join(bucket, name)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        shutil.copyfile(os.path.join(folder, name), target)
+    print(f"✅ Uploaded {len(names)} changed files and the manifest to {bucket}")
+    return names
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 4 or sys.argv[1] not in ("fetch", "upload"):
+        print(__doc__)
+        sys.exit(2)
+    if sys.argv[1] == "fetch":
+        fetch(sys.argv[2], sys.argv[3])
+    else:
+        upload(sys.argv[2], sys.argv[3])
@@ -0,0 +1,112 @@
+import os
+import json
+import hashlib
+import numpy as np
+import pandas as pd
+from src import aggregate
+from src import cache
+
+# opt-in: hashing the run ids costs about as much as grouped pandas stats on a few 100k rows,
+# so this pays off when the statistics get more expensive than a single groupby
+MEMO_ENABLED = os.environ.get("MEMO_STATS", "0") == "1"
+MEMO_FOLDER = os.path.join(cache.CACHE_FOLDER, "memo") if cache.CACHE_FOLDER and MEMO_ENABLED else ""
+# least recently used entries are evicted once the memo folder grows past this size
+MEMO_MAX_BYTES = int(float(os.environ.get("MEMO_MAX_MB", "64")) * 2**20)
+# columns identifying a run; a group's key changes as soon as one of its runs is added or removed
+KEY_COLUMNS = ("_id", "timestamp")
+# bump when the statistics computed by aggregate.summarize change
+VERSION = "1"
+STATS = {"hits": 0, "misses": 0, "evicted": 0}
+
+
+def group_keys(frame, by, metrics, namespace):
+    """Content hash of every group: its run ids/timestamps plus what is computed from them."""
+    columns = [c for c in KEY_COLUMNS if c in frame.columns]
+    row_hashes = pd.util.hash_pandas_object(frame[columns], index=False).to_numpy()
+    header = json.dumps([VERSION, namespace, list(metrics), list(aggregate.STATS), list(aggregate.QUANTILES)])
+    keys = {}
+    for group, positions in frame.groupby(by, observed=True, sort=True).indices.items():
+        digest = hashlib.sha256(header.encode())
+        digest.update(np.sort(row_hashes[positions]).tobytes())
+        keys[group] = digest.hexdigest()
+    return keys
+
+
+def _path(key, folder):
+    return os.path.join(folder, f"{key}.json")
+
+
+def _load(key, folder):
+    path = _path(key, folder)
+    try:
+        with open(path, encoding="utf-8") as f:
+            entry = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+    # reads refresh the mtime, which is what the LRU eviction orders by
+    os.utime(path)
+    return entry
+
+
+def _store(key, columns, values, folder):
+    path = _path(key, folder)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"columns": [list(c) for c in columns], "values": values}, f)
+    os.replace(tmp_path, path)
+
+
+def evict(folder=MEMO_FOLDER, max_bytes=MEMO_MAX_BYTES):
+    """Delete the least recently used entries until the folder fits in max_bytes."""
+    if not folder or not os.path.isdir(folder):
+        return 0
+    entries = []
+    for name in os.listdir(folder):
+        path = os.path.join(folder, name)
+        stat = os.stat(path)
+        entries.append((stat.st_mtime, stat.st_size, path))
+    total = sum(size for _, size, _ in entries)
+    evicted = 0
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        os.remove(path)
+        total -= size
+        evicted += 1
+    STATS["evicted"] += evicted
+    return evicted
+
+
+def summarize(frame, by, metrics, namespace, folder=MEMO_FOLDER):
+    """aggregate.summarize with every group's row memoised on disk by its content hash.
+
+    Only groups whose runs changed since they were last seen are recomputed.
+    """
+    if not folder or not len(frame):
+        return aggregate.summarize(frame, by, metrics)
+    os.makedirs(folder, exist_ok=True)
+    keys = group_keys(frame, by, metrics, namespace)
+    columns, rows, missing = None, {}, []
+    for group, key in keys.items():
+        entry = _load(key, folder)
+        if entry is None:
+            missing.append(group)
+        else:
+            columns = columns or [tuple(c) for c in entry["columns"]]
+            rows[group] = entry["values"]
+    STATS["hits"] += len(rows)
+    STATS["misses"] += len(missing)
+    if missing:
+        computed = aggregate.summarize(frame[frame[by].isin(missing)], by, metrics)
+        columns = list(computed.columns)
+        for group, row in zip(computed.index, computed.to_numpy(dtype="float64")):
+            values = [None if np.isnan(v) else float(v) for v in row]
+            _store(keys[group], columns, values, folder)
+            rows[group] = values
+        evict(folder)
+    summary = pd.DataFrame(
+        np.array([rows[group] for group in keys], dtype="float64"),
+        index=pd.Index(list(keys), name=by),
+        columns=pd.MultiIndex.from_tuples(columns),
+    )
+    return summary.astype({column: "int64" for column in summary.columns if column[1] == "count"})
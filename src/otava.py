@@ -1,10 +1,19 @@
 import subprocess
 import os
+import time
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from src import pool
 
+OTAVA_CONFIGS = ("otava-time.yaml", "otava-memory.yaml", "otava-cpu.yaml")
+OTAVA_TESTS = ("darwin-amd", "darwin-arm", "linux-amd", "linux-arm", "windows-amd")
+# shared by every caller, so concurrent regression stages together stay within the CPU limit
+_SLOTS = threading.BoundedSemaphore(pool.default_workers("OTAVA_WORKERS"))
 
-def run_otava(test_name, config_path, output_format="regressions_only"):
-    
+
+def _analyze(test_name, config_path, output_format):
     config_path = str(Path(config_path).resolve())
 
     if not os.path.exists(config_path):
@@ -12,13 +21,26 @@ def run_otava(test_name, config_path, output_format="regressions_only"):
 
     env = os.environ.copy()
     env["OTAVA_CONFIG"] = config_path
-    result = subprocess.run(
-        ["otava", "analyze", test_name, "--output", output_format],
-        env=env,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE, 
-        text=True,
-    )
+    with _SLOTS:
+        started = time.perf_counter()
+        # output goes to files so the process can be reaped with os.wait4, which reports its own CPU time
+        with tempfile.TemporaryFile("w+") as stdout, tempfile.TemporaryFile("w+") as stderr:
+            process = subprocess.Popen(
+                ["otava", "analyze", test_name, "--output", output_format],
+                env=env,
+                stdout=stdout,
+                stderr=stderr,
+            )
+            _, status, usage = os.wait4(process.pid, 0)
+            process.returncode = os.waitstatus_to_exitcode(status)
+            stdout.seek(0)
+            stderr.seek(0)
+            result = subprocess.CompletedProcess(process.args, process.returncode, stdout.read(), stderr.read())
+        return result, time.perf_counter() - started, usage.ru_utime + usage.ru_stime
+
+
+def run_otava(test_name, config_path, output_format="regressions_only"):
+    result, _, _ = _analyze(test_name, config_path, output_format)
     
     if result.returncode != 0:
         raise RuntimeError(
@@ -28,6 +50,42 @@ def run_otava(test_name, config_path, output_format="regressions_only"):
     stdout = result.stdout.strip()
     return stdout
 
+
+def run_otava_jobs(jobs, output_format="regressions_only", max_workers=None):
+    """Run `otava analyze` for every (test_name, config_path) job on a thread pool.
+
+    At most OTAVA_WORKERS subprocesses run at once across all concurrent calls.
+
+    Returns one dict per job, in job order, with the job, its stdout/stderr,
+    return code, wall time and CPU time in seconds. Failures are reported, not raised.
+    """
+    def run(job):
+        test_name, config_path = job
+        try:
+            result, seconds, cpu_seconds = _analyze(test_name, config_path, output_format)
+        except OSError as e:
+            return {"test": test_name, "config": config_path, "stdout": "", "stderr": str(e),
+                    "returncode": -1, "seconds": 0.0, "cpu_seconds": 0.0}
+        return {"test": test_name, "config": config_path, "stdout": result.stdout.strip(),
+                "stderr": result.stderr, "returncode": result.returncode, "seconds": seconds,
+                "cpu_seconds": cpu_seconds}
+
+    with ThreadPoolExecutor(max_workers=max_workers or pool.default_workers("OTAVA_WORKERS")) as executor:
+        results = list(executor.map(run, jobs))
+    for r in results:
+        print(f"otava analyze {r['test']} ({r['config']}) took {r['seconds']:.1f}s")
+    return results
+
+
+def check_results(results):
+    failed = [r for r in results if r["returncode"] != 0]
+    if failed:
+        raise RuntimeError(
+            "\n".join(f"otava analyze failed for {r['test']} ({r['config']})\n{r['stderr']}" for r in failed)
+        )
+    return results
+
+
 def handle_regression_result(stdout):
     if "No regressions found" in stdout:
         return ""
@@ -38,4 +96,3 @@ def handle_regression_result(stdout):
         else:
             result+="\n"        
     return result
-
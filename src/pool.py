@@ -0,0 +1,48 @@
+import os
+import math
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+# imported once by the fork server, so workers start with them loaded instead of
+# each importing the main script and its dependencies again
+FORKSERVER_PRELOAD = ["__main__", "src.charts", "src.changepoint"]
+
+
+def cpu_limit():
+    """CPUs available to this container according to its cgroup quota, or the host CPU count."""
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            return int(quota) / int(period)
+    except (OSError, ValueError):
+        pass
+    try:
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us") as f:
+            quota = int(f.read())
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_period_us") as f:
+            period = int(f.read())
+        if quota > 0:
+            return quota / period
+    except (OSError, ValueError):
+        pass
+    return os.cpu_count() or 1
+
+
+def default_workers(env_name):
+    """Worker count from env_name, defaulting to the container CPU limit rounded up."""
+    workers = os.environ.get(env_name)
+    if workers:
+        return max(1, int(workers))
+    return max(1, math.ceil(cpu_limit()))
+
+
+def process_pool(max_workers):
+    """A process pool that is safe to open while other threads run.
+
+    Forking a multi-threaded process can deadlock the child on a lock held by
+    another thread, so workers are started from a fork server instead.
+    """
+    context = multiprocessing.get_context("forkserver")
+    context.set_forkserver_preload(FORKSERVER_PRELOAD)
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=context)
@@ -0,0 +1,97 @@
+import math
+import pandas as pd
+from src import ingest
+from src import aggregate
+
+COMPOSITE_SIZE = 500
+PERCENTS = {"median": 50.0, **{name: q * 100 for name, q in aggregate.QUANTILES.items()}}
+# key fields of the summaries and the keyword fields they aggregate on
+KEY_FIELDS = {"category": "category.keyword", "bundle": "bundle.keyword"}
+
+
+def build_summary_query(by, metrics, after=None, size=COMPOSITE_SIZE):
+    """Composite aggregation over the by keys, with stats and percentiles of every metric per bucket."""
+    aggs = {}
+    for metric in metrics:
+        aggs[f"{metric}_stats"] = {"extended_stats": {"field": metric}}
+        aggs[f"{metric}_percentiles"] = {"percentiles": {"field": metric, "percents": list(PERCENTS.values())}}
+    composite = {
+        "size": size,
+        "sources": [{key: {"terms": {"field": KEY_FIELDS[key]}}} for key in by],
+    }
+    if after is not None:
+        composite["after"] = after
+    return {
+        "size": 0,
+        "query": {"bool": {"filter": [{"terms": {"category.keyword": list(ingest.PLATFORM_MAP)}}]}},
+        "aggs": {"summary": {"composite": composite, "aggs": aggs}},
+    }
+
+
+def summary_buckets(client, by, metrics, index=ingest.INDEX_NAME, size=COMPOSITE_SIZE):
+    after = None
+    while True:
+        response = client.search(index=index, body=build_summary_query(by, metrics, after, size))
+        summary = response["aggregations"]["summary"]
+        yield from summary["buckets"]
+        after = summary.get("after_key")
+        if after is None or len(summary["buckets"]) < size:
+            return
+
+
+def _value(value):
+    return math.nan if value is None else float(value)
+
+
+def _row(bucket, metrics):
+    row = {}
+    for metric in metrics:
+        stats = bucket[f"{metric}_stats"]
+        percentiles = bucket[f"{metric}_percentiles"]["values"]
+        count = stats["count"]
+        # extended_stats reports the population deviation, pandas the sample one
+        std = _value(stats.get("std_deviation"))
+        row[(metric, "mean")] = _value(stats.get("avg"))
+        row[(metric, "median")] = _value(percentiles.get(str(PERCENTS["median"])))
+        row[(metric, "std")] = std * math.sqrt(count / (count - 1)) if count > 1 else math.nan
+        row[(metric, "count")] = count
+        for name in aggregate.QUANTILES:
+            row[(metric, name)] = _value(percentiles.get(str(PERCENTS[name])))
+    return row
+
+
+def fetch_summary(client, by, metrics, index=ingest.INDEX_NAME):
+    """Server-side equivalent of aggregate.summarize over the whole index.
+
+    Returns a frame indexed by the by keys (a MultiIndex for several keys) with
+    the same (metric, stat) columns. Percentiles are the approximate (t-digest)
+    ones computed by OpenSearch.
+    """
+    keys, rows = [], []
+    for bucket in summary_buckets(client, by, metrics, index):
+        keys.append(tuple(bucket["key"][key] for key in by))
+        rows.append(_row(bucket, metrics))
+    if len(by) > 1:
+        index = pd.MultiIndex.from_frame(pd.DataFrame(keys, columns=by))
+    else:
+        index = pd.Index([key[0] for key in keys], name=by[0])
+    # same column order as aggregate.summarize
+    columns = pd.MultiIndex.from_tuples(
+        [(metric, stat) for metric in metrics for stat in aggregate.STATS]
+        + [(metric, name) for name in aggregate.QUANTILES for metric in metrics]
+    )
+    return pd.DataFrame(rows, index=index, columns=columns).sort_index()
+
+
+def platform_summary(client, metrics, index=ingest.INDEX_NAME):
+    return fetch_summary(client, ["category"], metrics, index)
+
+
+def bundle_summaries(client, metrics, index=ingest.INDEX_NAME):
+    """Per-platform summaries by bundle, keyed like Platform_DATA."""
+    summary = fetch_summary(client, ["category", "bundle"], metrics, index)
+    return {
+        platform: summary.xs(category, level="category")
+        for category, platform in ingest.PLATFORM_MAP.items()
+        if category in summary.index.get_level_values("category")
+    }
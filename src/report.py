@@ -0,0 +1,40 @@
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache
+from src import cache
+
+
+def _bytecode_cache():
+    if not cache.CACHE_FOLDER:
+        return FileSystemBytecodeCache()
+    directory = os.path.join(cache.CACHE_FOLDER, "jinja")
+    os.makedirs(directory, exist_ok=True)
+    return FileSystemBytecodeCache(directory)
+
+
+# one environment for every page, so each template is compiled once and its bytecode reused across runs
+ENV = Environment(loader=FileSystemLoader('.'), bytecode_cache=_bytecode_cache())
+
+
+def to_json(data):
+    """Compact JSON that is safe to embed in a <script> element."""
+    text = json.dumps(data, separators=(",", ":"), allow_nan=False)
+    return text.replace("<", "\\u003c").replace(">", "\\u003e").replace("&", "\\u0026")
+
+
+def render_page(template_name, output_path, **context):
+    html = ENV.get_template(template_name).render(**context)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        f.write(html)
+    return output_path
+
+
+def render_pages(pages, max_workers=4):
+    """Render independent pages concurrently; each page is (template name, output path, context)."""
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(render_page, name, path, **context) for name, path, context in pages]
+        paths = [f.result() for f in futures]
+    for path in paths:
+        print(f"✅ HTML file generated: {os.path.basename(path)}")
+    return paths
@@ -0,0 +1,172 @@
+import os
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, FIRST_COMPLETED, wait
+from src import pool
+from src import instrument
+
+# stages in threads mostly wait on files, subprocesses and the network, so this is not tied to the CPU limit
+THREAD_WORKERS = int(os.environ.get("STAGE_THREADS", "4"))
+
+
+class Stage:
+    """One pipeline step: func(*args, *inputs) produces the named outputs.
+
+    inputs and outputs name artifacts (frames, CSV files, rendered pages); a
+    stage with several outputs returns a tuple in the same order. kind "process"
+    runs it in a worker process, so func, args and inputs must be picklable.
+    """
+
+    def __init__(self, name, func, inputs=(), outputs=(), args=(), kind="thread"):
+        self.name = name
+        self.func = func
+        self.inputs = tuple(inputs)
+        self.outputs = tuple(outputs)
+        self.args = tuple(args)
+        self.kind = kind
+        self.started = None
+        self.finished = None
+
+
+class StageError(RuntimeError):
+    def __init__(self, stage, error):
+        super().__init__(f"stage {stage} failed: {error}")
+        self.stage = stage
+
+
+class _Inline:
+    """Stands in for the executors: runs each submitted call right away in the calling thread."""
+
+    def submit(self, func, *args):
+        future = Future()
+        try:
+            future.set_result(func(*args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def shutdown(self, wait=True):
+        pass
+
+
+def _run_thread(stage, values):
+    with instrument.stage(stage.name):
+        started = time.monotonic()
+        result = stage.func(*stage.args, *values)
+    return result, started, time.monotonic(), []
+
+
+def _run_process(func, args, values):
+    # a reused worker still holds the records it already handed back
+    instrument.take_records()
+    # monotonic is a system-wide clock on Linux, so child timings line up with the parent's
+    started = time.monotonic()
+    result = func(*args, *values)
+    return result, started, time.monotonic(), instrument.take_records()
+
+
+def _check(stages):
+    producers = {}
+    for stage in stages:
+        for output in stage.outputs:
+            if output in producers:
+                raise ValueError(f"{output} is produced by both {producers[output].name} and {stage.name}")
+            producers[output] = stage
+    for stage in stages:
+        missing = [i for i in stage.inputs if i not in producers]
+        if missing:
+            raise ValueError(f"stage {stage.name} needs {missing}, which no stage produces")
+    return producers
+
+
+def critical_path(stages):
+    """The chain of stages that bounded the run: from the last to finish back through its latest input."""
+    producers = {output: stage for stage in stages for output in stage.outputs}
+    done = [s for s in stages if s.finished is not None]
+    if not done:
+        return []
+    path = [max(done, key=lambda s: s.finished)]
+    while True:
+        parents = [producers[i] for i in path[-1].inputs if producers[i].finished is not None]
+        if not parents:
+            return path[::-1]
+        path.append(max(parents, key=lambda s: s.finished))
+
+
+def run(stages, thread_workers=THREAD_WORKERS, process_workers=None, serial=False):
+    """Run the stages as soon as their inputs exist, threads and processes side by side.
+
+    Returns every produced artifact by name. When a stage fails, nothing new
+    is started, running stages are awaited, the stages depending on it are
+    reported as skipped and StageError is raised.
+
+    serial runs every stage, process stages included, one at a time in the
+    calling thread, so a profiler started there sees all of them.
+    """
+    _check(stages)
+    results, pending, running = {}, list(stages), {}
+    failure = cause = None
+    origin = time.monotonic()
+    threads = _Inline() if serial else ThreadPoolExecutor(max_workers=thread_workers)
+    processes = None
+    try:
+        while pending or running:
+            if failure is None:
+                for stage in [s for s in pending if all(i in results for i in s.inputs)]:
+                    pending.remove(stage)
+                    values = [results[i] for i in stage.inputs]
+                    if stage.kind == "process" and not serial:
+                        if processes is None:
+                            processes = pool.process_pool(
+                                process_workers or pool.default_workers("STAGE_PROCESSES"))
+                        future = processes.submit(_run_process, stage.func, stage.args, values)
+                    else:
+                        future = threads.submit(_run_thread, stage, values)
+                    running[future] = stage
+            if not running:
+                break
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                stage = running.pop(future)
+                try:
+                    result, stage.started, stage.finished, records = future.result()
+                except Exception as e:
+                    print(f"❌ Stage {stage.name} failed: {e}")
+                    if failure is None:
+                        failure, cause = StageError(stage.name, e), e
+                    continue
+                if stage.kind == "process" and not serial:
+                    instrument.add(stage.name, kind="process",
+                                   wall_seconds=round(stage.finished - stage.started, 4))
+                    # e.g. the changepoint records of the native backend, made in the worker
+                    instrument.extend(records, stage.name)
+                outputs = result if len(stage.outputs) > 1 else (result,)
+                results.update(zip(stage.outputs, outputs))
+    finally:
+        threads.shutdown(wait=True)
+        if processes is not None:
+            processes.shutdown(wait=True)
+
+    for stage in stages:
+        if stage.started is not None:
+            instrument.add("schedule", task=stage.name, kind=stage.kind,
+                           start_seconds=round(stage.started - origin, 4),
+                           end_seconds=round(stage.finished - origin, 4))
+    if failure is None and pending:
+        raise ValueError(f"dependency cycle between {', '.join(s.name for s in pending)}")
+    if failure is not None:
+        skipped = [s.name for s in pending]
+        if skipped:
+            print(f"⏭️ Skipped after the failure: {', '.join(skipped)}")
+        raise failure from cause
+    report_critical_path(stages)
+    return results
+
+
+def report_critical_path(stages):
+    path = critical_path(stages)
+    if not path:
+        return
+    total = path[-1].finished - path[0].started
+    steps = " → ".join(f"{s.name} ({s.finished - s.started:.2f}s)" for s in path)
+    print(f"Critical path {total:.2f}s: {steps}")
+    instrument.add("critical_path", stages=[s.name for s in path], wall_seconds=round(total, 4))
@@ -0,0 +1,50 @@
+import numpy as np
+
+# values are shipped as integers in hundredths, which keeps the JSON short and exact to 2 decimals
+SCALE = 100
+
+
+def _epoch_seconds(timestamps):
+    return np.asarray(timestamps).astype("datetime64[s]").astype("int64")
+
+
+def _scaled(values):
+    values = np.asarray(values, dtype="float64")
+    scaled = np.round(values * SCALE)
+    return [None if np.isnan(v) else int(v) for v in scaled]
+
+
+def encode(timestamps, columns, bundles=None, bundle_names=None):
+    """Columnar, delta-encoded form of one series.
+
+    t0 is the first timestamp in epoch seconds and dt the gaps between samples;
+    every entry of columns becomes a list of values scaled by SCALE (null for
+    missing), and bundles, when given, a list of indexes into bundle_names.
+    """
+    seconds = _epoch_seconds(timestamps)
+    encoded = {
+        "t0": int(seconds[0]) if len(seconds) else 0,
+        "dt": np.diff(seconds).tolist(),
+    }
+    if bundles is not None:
+        lookup = {name: i for i, name in enumerate(bundle_names)}
+        encoded["b"] = [lookup[str(b)] for b in bundles]
+    for name, values in columns.items():
+        encoded[name] = _scaled(values)
+    return encoded
+
+
+def family_payload(Platform_DATA, metrics):
+    """One payload for a metric family: every platform's history of the metrics, by bundle."""
+    bundle_names = sorted({str(b) for frame in Platform_DATA.values() for b in frame["bundle"].dropna().unique()})
+    platforms = {}
+    for key, frame in Platform_DATA.items():
+        frame = frame.dropna(subset=["timestamp", "bundle"]).sort_values("timestamp")
+        platforms[key] = encode(
+            frame["timestamp"].to_numpy(),
+            {metric: frame[metric].to_numpy() for metric in metrics},
+            frame["bundle"].to_numpy(),
+            bundle_names,
+        )
+    return {"scale": SCALE, "metrics": list(metrics), "bundles": bundle_names, "platforms": platforms}
+
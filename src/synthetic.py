@@ -0,0 +1,57 @@
+import random
+from datetime import datetime, timedelta, timezone
+from src import ingest
+
+
+def _cpu_block(rnd, base):
+    samples_mean = rnd.gauss(base, base * 0.15)
+    return {
+        "derived": {
+            "max": min(100.0, samples_mean * rnd.uniform(1.8, 3.0)),
+            "Min": max(0.0, samples_mean * rnd.uniform(0.0, 0.3)),
+            "Mean": samples_mean,
+            "P95": min(100.0, samples_mean * rnd.uniform(1.5, 2.2)),
+            "Std": samples_mean * rnd.uniform(0.3, 0.6),
+            "Spike Count": float(rnd.randint(0, 8)),
+            "gt_80": rnd.uniform(0, 10),
+            "lt_20": rnd.uniform(30, 70),
+            "lt_10": rnd.uniform(10, 40),
+        },
+        # raw samples are indexed too but never pulled by the report
+        "samples": [round(rnd.uniform(0, 100), 1) for _ in range(16)],
+    }
+
+
+def generate_hits(docs, seed=0, bundles=12, start=datetime(2024, 1, 1, tzinfo=timezone.utc)):
+    """Yield `docs` synthetic crc-test hits spread over the five openshift platforms.
+
+    Runs are nightly per platform, bundles are released in order over the
+    history, and each bundle shifts the time/memory baselines slightly so
+    change-point detection has something to find.
+    """
+    rnd = random.Random(seed)
+    categories = list(ingest.PLATFORM_MAP)
+    runs_per_platform = max(1, docs // len(categories))
+    for i in range(docs):
+        category = categories[i % len(categories)]
+        run = i // len(categories)
+        release = min(bundles - 1, run * bundles // runs_per_platform)
+        bundle = f"4.{18 + release // 4}.{release % 4}"
+        drift = 1 + 0.03 * release
+        source = {
+            "category": category,
+            "bundle": bundle,
+            "timestamp": (start + timedelta(days=run, minutes=7 * (i % len(categories))))
+            .strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "time-start": rnd.gauss(270, 25) * drift,
+            "time-stop": rnd.gauss(22, 4),
+            "memory-start": rnd.gauss(10200, 300) * drift,
+            "memory-deployment": rnd.gauss(11000, 350) * drift,
+            "memory-stop": rnd.gauss(150, 20),
+            "host": f"{category}-runner-{i % 3}",
+        }
+        # older runs predate the CPU sampling
+        if rnd.random() > 0.1:
+            source["cpu-Start"] = _cpu_block(rnd, 35)
+            source["cpu-Stop"] = _cpu_block(rnd, 12)
+        yield {"_index": ingest.INDEX_NAME, "_id": f"synthetic-{seed}-{i}", "_source": source}
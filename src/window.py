@@ -0,0 +1,135 @@
+import os
+import numpy as np
+import pandas as pd
+from src import aggregate
+
+# keep only the last N days and/or the last N runs per platform and bundle; 0 keeps everything
+WINDOW_DAYS = int(os.environ.get("ANALYSIS_WINDOW_DAYS", "0"))
+WINDOW_RUNS = int(os.environ.get("ANALYSIS_WINDOW_RUNS", "0"))
+
+
+def enabled():
+    return bool(WINDOW_DAYS or WINDOW_RUNS)
+
+
+def window_start(now=None):
+    """Oldest timestamp in the window (naive UTC, like the ingested timestamps), or None."""
+    if not WINDOW_DAYS:
+        return None
+    now = pd.Timestamp.now(tz="UTC").tz_localize(None) if now is None else pd.Timestamp(now)
+    return now - pd.Timedelta(days=WINDOW_DAYS)
+
+
+def query_since(last_seen, rollups=None, now=None):
+    """Lower bound of every platform's fetch: the later of its last cached timestamp and the window start.
+
+    last_seen maps a platform to its last cached timestamp. A platform with
+    neither cached rows nor a rollup is left out, so its whole history is
+    fetched once and the rows older than the window can be rolled up.
+    """
+    start = window_start(now)
+    if start is None:
+        return dict(last_seen)
+    since = {}
+    for platform in sorted(set(last_seen) | set(rollups or {})):
+        stamp = last_seen.get(platform)
+        since[platform] = start.isoformat() if stamp is None or pd.Timestamp(stamp) < start else stamp
+    return since
+
+
+def split(frame, now=None):
+    """Split a platform frame into (rows in the window, rows that fell out of it)."""
+    keep = pd.Series(True, index=frame.index)
+    start = window_start(now)
+    if start is not None:
+        keep &= frame["timestamp"] >= start
+    if WINDOW_RUNS:
+        newest_first = frame["timestamp"].rank(method="first", ascending=False)
+        rank = newest_first.groupby(frame["bundle"], observed=True).rank(method="first")
+        keep &= rank <= WINDOW_RUNS
+    return frame[keep].reset_index(drop=True), frame[~keep].reset_index(drop=True)
+
+
+def rollup(frame, metrics):
+    """Per-bundle count, sum and sum of squares of every metric, with flat "metric.stat" columns."""
+    values = frame[metrics].astype("float64")
+    grouped = pd.concat([values, values.pow(2).add_suffix(".sq")], axis=1).groupby(
+        frame["bundle"].astype(str), sort=True
+    )
+    sums = grouped.sum(min_count=1)
+    counts = grouped.count()
+    result = pd.DataFrame(index=sums.index)
+    for metric in metrics:
+        result[f"{metric}.count"] = counts[metric]
+        result[f"{metric}.sum"] = sums[metric].fillna(0.0)
+        result[f"{metric}.sumsq"] = sums[f"{metric}.sq"].fillna(0.0)
+    result.index.name = "bundle"
+    return result
+
+
+def apply_window(Platform_DATA, rollups, metrics, now=None):
+    """Trim every platform to the window, folding the expired rows into its rollup.
+
+    Returns the trimmed frames, the updated rollups and the number of expired rows.
+    """
+    kept, rollups, expired_rows = {}, dict(rollups), 0
+    for platform, frame in Platform_DATA.items():
+        window, expired = split(frame, now)
+        # a platform without runs in the window only lives on in its rollup
+        if len(window):
+            kept[platform] = window
+        if len(expired):
+            rollups[platform] = merge_rollups(rollups.get(platform), rollup(expired, metrics))
+            expired_rows += len(expired)
+    return kept, rollups, expired_rows
+
+
+def merge_rollups(old, new):
+    if old is None or not len(old):
+        return new
+    if new is None or not len(new):
+        return old
+    return old.add(new, fill_value=0).sort_index()
+
+
+def platform_totals(rollups, categories):
+    """Rollups summed over bundles, one row per platform indexed by category like the platform summary."""
+    return pd.DataFrame({categories[platform]: r.sum() for platform, r in rollups.items() if len(r)}).T
+
+
+def _totals(summary, metric):
+    stats = summary[metric]
+    count = stats["count"].astype("float64")
+    mean = stats["mean"].astype("float64")
+    std = stats["std"].astype("float64").fillna(0.0)
+    return count, mean * count, std.pow(2) * (count - 1).clip(lower=0) + count * mean.pow(2)
+
+
+def combine(summary, totals, metrics):
+    """Merge a window summary (as from aggregate.summarize) with rollup totals indexed the same way.
+
+    Mean, std and count cover both; median and percentiles are only kept for keys
+    without rolled-up rows, since they cannot be merged from totals. summary may
+    be None when every row of a platform has been rolled up.
+    """
+    if summary is None:
+        summary = aggregate.empty_summary(metrics)
+    index = summary.index.astype(str).union(totals.index.astype(str))
+    summary = summary.set_axis(summary.index.astype(str)).reindex(index)
+    totals = totals.set_axis(totals.index.astype(str)).reindex(index)
+    combined = pd.DataFrame(index=index, columns=summary.columns, dtype="float64")
+    for metric in metrics:
+        count, total, sumsq = (s.fillna(0.0) for s in _totals(summary, metric))
+        rolled = totals[f"{metric}.count"].fillna(0.0)
+        count = count + rolled
+        total = total + totals[f"{metric}.sum"].fillna(0.0)
+        sumsq = sumsq + totals[f"{metric}.sumsq"].fillna(0.0)
+        mean = total / count.where(count > 0)
+        variance = (sumsq - count * mean.pow(2)) / (count - 1).where(count > 1)
+        combined[(metric, "count")] = count
+        combined[(metric, "mean")] = mean
+        combined[(metric, "std")] = np.sqrt(variance.clip(lower=0))
+        for stat in ["median", *aggregate.QUANTILES]:
+            combined[(metric, stat)] = summary[(metric, stat)].where(rolled == 0)
+    combined.index.name = summary.index.name
+    return combined
@@ -0,0 +1,137 @@
+        // Draws the metric history charts client-side from the compact series written by src/series.py:
+        // {scale, metrics, bundles, platforms: {name: {t0, dt: [...], b: [...], <metric>: [...]}}}
+        const CHART_COLORS = ["#1a73e8", "#e8710a", "#188038", "#d93025", "#9334e6", "#12b5cb", "#f9ab00"];
+        const SVG_NS = "http://www.w3.org/2000/svg";
+
+        function decodeSeries(encoded, scale, metric) {
+            // 还原时间戳并去掉缺失值
+            const points = [];
+            let t = encoded.t0;
+            encoded[metric].forEach((value, i) => {
+                if (i > 0) t += encoded.dt[i - 1];
+                if (value !== null) points.push({ t: t, v: value / scale, b: encoded.b ? encoded.b[i] : null });
+            });
+            return points;
+        }
+
+        function svgElement(name, attrs) {
+            const el = document.createElementNS(SVG_NS, name);
+            Object.entries(attrs).forEach(([k, v]) => el.setAttribute(k, v));
+            return el;
+        }
+
+        function formatDate(t, withTime) {
+            const iso = new Date(t * 1000).toISOString();
+            return withTime ? iso.slice(0, 16).replace("T", " ") : iso.slice(0, 10);
+        }
+
+        function drawChart(svg, lines, view, format, width, height) {
+            // 绘制坐标轴与折线
+            const pad = { left: 70, right: 16, top: 12, bottom: 32 };
+            svg.replaceChildren();
+            const visible = lines.map(line => line.points.filter(p => p.t >= view.from && p.t <= view.to));
+            const values = visible.flat().map(p => p.v);
+            if (values.length === 0) {
+                svg.appendChild(svgElement("text", { x: width / 2, y: height / 2, "text-anchor": "middle" })).textContent = "No data";
+                return null;
+            }
+            // reduce rather than Math.min(...values), which overflows the stack on long histories
+            let low = values.reduce((a, b) => Math.min(a, b)), high = values.reduce((a, b) => Math.max(a, b));
+            if (low === high) { low -= 1; high += 1; }
+            const x = t => pad.left + (t - view.from) / Math.max(view.to - view.from, 1) * (width - pad.left - pad.right);
+            const y = v => height - pad.bottom - (v - low) / (high - low) * (height - pad.top - pad.bottom);
+
+            const withTime = view.to - view.from < 3 * 86400;
+            for (let i = 0; i <= 4; i++) {
+                const v = low + (high - low) * i / 4;
+                const t = view.from + (view.to - view.from) * i / 4;
+                svg.appendChild(svgElement("line", { x1: pad.left, x2: width - pad.right, y1: y(v), y2: y(v), stroke: "#eee" }));
+                svg.appendChild(svgElement("text", { x: pad.left - 6, y: y(v) + 4, "text-anchor": "end", "font-size": 11 })).textContent = format(v);
+                svg.appendChild(svgElement("text", { x: x(t), y: height - 10, "text-anchor": "middle", "font-size": 11 })).textContent = formatDate(t, withTime);
+            }
+            visible.forEach((points, i) => {
+                if (points.length === 0) return;
+                const path = svgElement("polyline", {
+                    points: points.map(p => `${x(p.t).toFixed(1)},${y(p.v).toFixed(1)}`).join(" "),
+                    fill: "none", stroke: lines[i].color, "stroke-width": 1.5,
+                });
+                path.appendChild(svgElement("title", {})).textContent = lines[i].name;
+                svg.appendChild(path);
+            });
+            return { x: x, pad: pad };
+        }
+
+        function renderChart(id, payload, metric, format) {
+            // 可缩放的折线图：拖动选择时间范围放大，双击还原；可按平台和 bundle 过滤
+            const container = document.getElementById(id);
+            const width = 900, height = 360;
+            const platforms = Object.keys(payload.platforms);
+            const all = platforms.map((name, i) => ({
+                name: name,
+                color: CHART_COLORS[i % CHART_COLORS.length],
+                points: decodeSeries(payload.platforms[name], payload.scale, metric),
+            }));
+            const times = all.flatMap(line => line.points.map(p => p.t));
+            const full = { from: times.reduce((a, b) => Math.min(a, b), Infinity), to: times.reduce((a, b) => Math.max(a, b), -Infinity) };
+            let view = { ...full };
+            const shown = new Set(platforms);
+            let bundle = "";
+
+            const controls = document.createElement("div");
+            controls.className = "chart-controls";
+            all.forEach(line => {
+                const label = document.createElement("label");
+                const box = document.createElement("input");
+                box.type = "checkbox";
+                box.checked = true;
+                box.addEventListener("change", () => {
+                    box.checked ? shown.add(line.name) : shown.delete(line.name);
+                    redraw();
+                });
+                label.style.color = line.color;
+                label.append(box, line.name);
+                controls.appendChild(label);
+            });
+            const select = document.createElement("select");
+            ["", ...payload.bundles].forEach(name => {
+                const option = document.createElement("option");
+                option.value = name;
+                option.textContent = name || "all bundles";
+                select.appendChild(option);
+            });
+            select.addEventListener("change", () => { bundle = select.value; redraw(); });
+            controls.appendChild(select);
+
+            const svg = svgElement("svg", { viewBox: `0 0 ${width} ${height}`, width: "100%" });
+            container.append(controls, svg);
+
+            let scales = null;
+            function redraw() {
+                const index = payload.bundles.indexOf(bundle);
+                const lines = all
+                    .filter(line => shown.has(line.name))
+                    .map(line => ({ ...line, points: bundle ? line.points.filter(p => p.b === index) : line.points }));
+                scales = drawChart(svg, lines, view, format, width, height);
+            }
+
+            function toTime(event) {
+                const box = svg.getBoundingClientRect();
+                const px = (event.clientX - box.left) * width / box.width;
+                const ratio = (px - scales.pad.left) / (width - scales.pad.left - scales.pad.right);
+                return view.from + Math.min(Math.max(ratio, 0), 1) * (view.to - view.from);
+            }
+
+            let dragStart = null;
+            svg.addEventListener("mousedown", event => { if (scales) dragStart = toTime(event); });
+            svg.addEventListener("mouseup", event => {
+                if (dragStart === null) return;
+                const end = toTime(event);
+                if (Math.abs(end - dragStart) > 60) {
+                    view = { from: Math.min(dragStart, end), to: Math.max(dragStart, end) };
+                    redraw();
+                }
+                dragStart = null;
+            });
+            svg.addEventListener("dblclick", () => { view = { ...full }; redraw(); });
+            redraw();
+        }
@@ -0,0 +1,61 @@
+        // Builds the report tables client-side from the compact JSON written by src/report.py:
+        // {columns: [...], rows: [{label, mean: [...], median: [...], p95: [...], count: [...]}]}
+        function formatDuration(seconds) {
+            // 将秒数转换为 1m02s 格式
+            const minutes = Math.floor(seconds / 60);
+            const sec = Math.floor(seconds % 60);
+            return `${minutes}m${String(sec).padStart(2, "0")}s`;
+        }
+
+        function formatFixed(value) {
+            return value.toFixed(2);
+        }
+
+        function formatInt(value) {
+            return String(Math.trunc(value));
+        }
+
+        function highlight(cells, values) {
+            // 高亮每行的最大值和最小值
+            if (cells.length <= 1) return;
+            const present = values.filter(v => v !== null);
+            if (present.length === 0) return;
+            const max = Math.max(...present);
+            const min = Math.min(...present);
+            cells.forEach((td, i) => {
+                if (values[i] === max) td.classList.add("row-max");
+                if (values[i] === min) td.classList.add("row-min");
+            });
+        }
+
+        function fillTable(el, table, corner, format) {
+            const head = el.insertRow();
+            [corner, ...table.columns].forEach(text => {
+                const th = document.createElement("th");
+                th.textContent = text;
+                head.appendChild(th);
+            });
+            table.rows.forEach(row => {
+                const tr = el.insertRow();
+                tr.insertCell().textContent = row.label;
+                const cells = row.mean.map((value, i) => {
+                    const td = tr.insertCell();
+                    td.textContent = value === null ? "-" : format(value);
+                    if (value !== null) {
+                        // median and p95 are null for bundles that include rolled-up history
+                        const show = v => v === null ? "-" : format(v);
+                        td.title = `median ${show(row.median[i])} · p95 ${show(row.p95[i])} · runs ${row.count[i]}`;
+                    }
+                    return td;
+                });
+                highlight(cells, row.mean);
+            });
+        }
+
+        function renderTable(id, table, corner, format) {
+            fillTable(document.getElementById(id), table, corner, format);
+        }
+
+        function reportData() {
+            return JSON.parse(document.getElementById("report-data").textContent);
+        }
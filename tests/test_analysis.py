@@ -0,0 +1,89 @@
+import os
+import sys
+import json
+import pytest
+from src import otava
+from src import analysis
+from src import changepoint
+
+TIME = 1760745600  # 2025-10-18 00:00:00 UTC
+
+
+def _otava_output(test):
+    """`otava analyze <test> --output json` as otava prints it: the numbers are formatted strings."""
+    return {test: [{
+        "time": TIME,
+        "changes": [
+            {"metric": "time-start", "mean_before": "300.12", "mean_after": "345.6",
+             "stddev_before": "2.1", "stddev_after": "2.4", "pvalue": "0.000001",
+             "forward_change_percent": "15.2"},
+            {"metric": "time-stop", "mean_before": "20.5", "mean_after": "18.25",
+             "stddev_before": "0.5", "stddev_after": "0.5", "pvalue": "0.000001",
+             "forward_change_percent": "-11.0"},
+        ],
+    }]}
+
+
+@pytest.fixture
+def stub_otava(tmp_path, monkeypatch):
+    """An `otava` on PATH answering every test with _otava_output, and a config listing the exported files."""
+    outputs = tmp_path / "outputs"
+    outputs.mkdir()
+    config = {"tests": {}}
+    for test in otava.OTAVA_TESTS:
+        path = tmp_path / f"time_consume_{test}.csv"
+        path.write_text("timestamp,bundle,time-start,time-stop\n")
+        (outputs / f"{test}.json").write_text(json.dumps(_otava_output(test)))
+        config["tests"][test] = {
+            "file": str(path),
+            "metrics": {"time-start": {"direction": -1}, "time-stop": {"direction": -1}},
+        }
+    config_path = tmp_path / "otava-time.yaml"
+    config_path.write_text(json.dumps(config))  # JSON is YAML
+    bin_folder = tmp_path / "bin"
+    bin_folder.mkdir()
+    script = bin_folder / "otava"
+    script.write_text(
+        f"#!{sys.executable}\n"
+        "import sys\n"
+        f"print(open({str(outputs)!r} + '/' + sys.argv[2] + '.json').read())\n"
+    )
+    script.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_folder}{os.pathsep}{os.environ['PATH']}")
+    return config_path
+
+
+def test_otava_string_fields_are_parsed(stub_otava):
+    tests = analysis.run_config("otava", str(stub_otava))
+    assert sorted(tests) == sorted(otava.OTAVA_TESTS)
+    change = tests["linux-amd"][0]["changes"][0]
+    assert change["mean_before"] == 300.12 and change["forward_change_percent"] == 15.2
+    assert change["direction"] == -1
+
+    records = analysis.to_records({"time": tests})
+    assert len(records) == 2 * len(otava.OTAVA_TESTS)
+    start, stop = records[:2]
+    assert (start["metric"], start["mean_before"], start["mean_after"], start["regression"]) == \
+        ("time-start", 300.12, 345.6, True)
+    assert (stop["metric"], stop["regression"]) == ("time-stop", False)
+    # the artifact the notifier reads round-trips as JSON
+    assert json.loads(json.dumps(records)) == records
+
+    text = analysis.regression_text({"time": tests})["time"]
+    assert text.count("time-start:       300.12 -->       345.60 (  +15.2%)") == len(otava.OTAVA_TESTS)
+    assert "time-stop" not in text
+
+
+def test_format_regressions_without_regressions():
+    change = {"metric": "time-start", "mean_before": 300.0, "mean_after": 250.0,
+              "forward_change_percent": -16.7, "direction": -1}
+    assert changepoint.format_regressions([{"time": TIME, "changes": [change]}]) == "No regressions found!"
+
+
+def test_tests_without_an_export_are_skipped(stub_otava):
+    config = changepoint.load_config(str(stub_otava))
+    os.remove(config["darwin-arm"]["file"])
+    tests = analysis.run_config("otava", str(stub_otava))
+    assert tests["darwin-arm"] == []
+    assert len(tests["linux-amd"]) == 1
+    assert "darwin-arm" not in {r["platform"] for r in analysis.to_records({"time": tests})}
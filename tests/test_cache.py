@@ -0,0 +1,83 @@
+import os
+import asyncio
+import pandas as pd
+import pytest
+from src import cache
+from src import ingest
+from src import window
+from src import synthetic
+from src import async_ingest
+
+
+def _scroll(hits, since):
+    return ingest.load_platform_data(ingest.ReplayClient(hits), since=since, page_size=50)
+
+
+def _async(hits, since):
+    client = async_ingest.AsyncReplayClient(ingest.ReplayClient(hits))
+    return asyncio.run(async_ingest.load_platform_data(client, since=since, page_size=50))
+
+
+def _run(fetch, hits, folder):
+    """One incremental run as in connect_opensearch: load, fetch since the cache, merge, save."""
+    cached = cache.load_cache(folder)
+    fresh = fetch(hits, window.query_since(cache.last_seen(cached), cache.load_rollups(folder)))
+    Platform_DATA = cache.merge(cached, fresh)
+    cache.save_cache(Platform_DATA, folder)
+    return Platform_DATA, fresh
+
+
+@pytest.mark.parametrize("fetch", [_scroll, _async])
+def test_late_result_of_one_platform_is_fetched(tmp_path, fetch):
+    hits = list(synthetic.generate_hits(50))
+    linux = [h for h in hits if h["_source"]["category"] == "openshift-linux-amd64"]
+    darwin = [h for h in hits if h["_source"]["category"] == "openshift-darwin-arm64"]
+    # darwin's last nightly result is indexed only after linux's newer runs were cached
+    late = darwin[-1]
+    assert late["_source"]["timestamp"] < linux[-1]["_source"]["timestamp"]
+    first = [h for h in hits if h is not late]
+    _run(fetch, first, str(tmp_path))
+    Platform_DATA, fresh = _run(fetch, first + [late], str(tmp_path))
+    assert late["_id"] in set(Platform_DATA["darwin-arm64"]["_id"])
+    assert late["_id"] in set(fresh["darwin-arm64"]["_id"])
+    # the other platforms only refetch the documents sharing their last timestamp
+    assert len(fresh["linux-amd64"]) == 1
+
+
+def _sorted(frame):
+    return frame.sort_values("_id", ignore_index=True)
+
+
+@pytest.mark.parametrize("fetch", [_scroll, _async])
+def test_incremental_runs_match_a_full_fetch(tmp_path, fetch):
+    hits = list(synthetic.generate_hits(400))
+    cutoff = sorted(h["_source"]["timestamp"] for h in hits)[250]
+    first = [h for h in hits if h["_source"]["timestamp"] <= cutoff]
+    _run(fetch, first, str(tmp_path / "incremental"))
+    incremental, fresh = _run(fetch, hits, str(tmp_path / "incremental"))
+    # besides the new documents, only each platform's last cached one is fetched again
+    assert sum(len(v) for v in fresh.values()) == len(hits) - len(first) + len(ingest.PLATFORM_MAP)
+
+    full, _ = _run(fetch, hits, str(tmp_path / "full"))
+    assert sorted(incremental) == sorted(full)
+    for platform, frame in full.items():
+        assert not incremental[platform]["_id"].duplicated().any()
+        assert sorted(incremental[platform].columns) == sorted(frame.columns)
+        pd.testing.assert_frame_equal(
+            _sorted(incremental[platform])[sorted(frame.columns)], _sorted(frame)[sorted(frame.columns)],
+            check_categorical=False)
+
+    # the saved cache reloads to the same frames
+    reloaded = cache.load_cache(str(tmp_path / "incremental"))
+    for platform, frame in incremental.items():
+        pd.testing.assert_frame_equal(reloaded[platform], frame)
+
+
+def test_cache_of_another_format_is_discarded(tmp_path, monkeypatch):
+    folder = str(tmp_path)
+    _run(_scroll, list(synthetic.generate_hits(20)), folder)
+    assert cache.load_cache(folder)
+    monkeypatch.setattr(cache, "FORMAT_VERSION", "2")
+    assert cache.load_cache(folder) == {}
+    assert cache.load_rollups(folder) == {}
+    assert not [name for name in os.listdir(folder) if name.startswith("platform=")]
@@ -0,0 +1,134 @@
+import math
+import numpy as np
+import pandas as pd
+import pytest
+from src import changepoint
+
+
+@pytest.mark.parametrize("a, b, x, expected", [
+    (1.0, 1.0, 0.3, 0.3),
+    (2.5, 1.0, 0.4, 0.4 ** 2.5),
+    (1.0, 3.0, 0.2, 1 - 0.8 ** 3),
+    (7.0, 7.0, 0.5, 0.5),
+    (0.5, 0.5, 0.5, 0.5),
+])
+def test_betai_closed_forms(a, b, x, expected):
+    assert changepoint._betai(a, b, x) == pytest.approx(expected, rel=1e-10)
+
+
+def test_betai_bounds():
+    assert changepoint._betai(3.0, 0.5, 0.0) == 0.0
+    assert changepoint._betai(3.0, 0.5, 1.0) == 1.0
+
+
+def _samples_with_t(base, t):
+    """Two samples of the same spread whose Welch statistic is t, with df = 2 * (len(base) - 1)."""
+    se = math.sqrt(2 * base.var(ddof=1) / len(base))
+    return base, base + t * se
+
+
+@pytest.mark.parametrize("base, t, expected", [
+    # two-sided critical values of Student's t distribution
+    (np.array([-1.0, -1, -1, 1, 1, 1]), 2.228138852, 0.05),     # df 10
+    (np.array([-1.0, -1, -1, 1, 1, 1]), 3.169272673, 0.01),     # df 10
+    (np.array([-1.0] * 5 + [0] + [1] * 5), 2.085963447, 0.05),  # df 20
+])
+def test_ttest_pvalue_matches_t_table(base, t, expected):
+    left, right = _samples_with_t(base, t)
+    assert changepoint.ttest_pvalue(left, right) == pytest.approx(expected, abs=1e-6)
+
+
+def test_ttest_pvalue_is_symmetric():
+    rng = np.random.default_rng(3)
+    left, right = rng.normal(10, 1, 20), rng.normal(11, 2, 30)
+    assert changepoint.ttest_pvalue(left, right) == pytest.approx(changepoint.ttest_pvalue(right, left))
+
+
+def test_ttest_pvalue_without_variance():
+    flat = np.full(5, 3.0)
+    assert changepoint.ttest_pvalue(flat, flat) == 1.0
+    assert changepoint.ttest_pvalue(flat, flat + 1) == 0.0
+
+
+def _naive_divergence(x, tau):
+    left, right = x[:tau], x[tau:]
+    cross = np.abs(left[:, None] - right[None, :]).mean()
+    within_left = np.abs(left[:, None] - left[None, :]).sum() / (len(left) * (len(left) - 1))
+    within_right = np.abs(right[:, None] - right[None, :]).sum() / (len(right) * (len(right) - 1))
+    return len(left) * len(right) / len(x) * (2 * cross - within_left - within_right)
+
+
+def test_best_split_matches_pairwise_statistic():
+    x = np.random.default_rng(5).normal(0, 1, 30)
+    x[17:] += 2
+    taus = range(changepoint.MIN_SEGMENT, len(x) - changepoint.MIN_SEGMENT + 1)
+    expected = max(taus, key=lambda tau: _naive_divergence(x, tau))
+    tau, q = changepoint._best_split(x)
+    assert tau == expected
+    assert q == pytest.approx(_naive_divergence(x, expected))
+
+
+def test_detects_planted_step():
+    rng = np.random.default_rng(1)
+    values = np.r_[rng.normal(100, 1, 60), rng.normal(120, 1, 60)]
+    assert changepoint.change_points(values) == [60]
+
+
+def test_detects_step_beyond_one_window():
+    rng = np.random.default_rng(1)
+    values = np.r_[rng.normal(100, 1, 700), rng.normal(120, 1, 500)]
+    assert len(values) > changepoint.MAX_WINDOW
+    assert changepoint.change_points(values) == [700]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_nothing_found_on_flat_noise(seed):
+    values = np.random.default_rng(seed).normal(100, 1, 200)
+    assert changepoint.change_points(values) == []
+
+
+def test_threshold_drops_small_relative_changes():
+    rng = np.random.default_rng(2)
+    # a 2% step, far beyond the noise
+    values = np.r_[rng.normal(100, 0.2, 60), rng.normal(102, 0.2, 60)]
+    assert changepoint.change_points(values, threshold=0.1) == []
+    assert changepoint.change_points(values, threshold=0.01) == [60]
+
+
+def _frame(values):
+    return pd.DataFrame({
+        "timestamp": pd.date_range("2025-01-01", periods=len(values), freq="D"),
+        "bundle": "4.18.0",
+        "time-start": values,
+    })
+
+
+@pytest.mark.parametrize("direction, regression", [(-1, True), (1, False)])
+def test_direction_decides_regression(direction, regression):
+    rng = np.random.default_rng(4)
+    frame = _frame(np.r_[rng.normal(100, 1, 40), rng.normal(130, 1, 40)])
+    config = {"time_column": "timestamp", "attributes": ["bundle"],
+              "metrics": {"time-start": {"direction": direction, "threshold": 0.1}}}
+    [cp] = changepoint.analyze_test(frame, config)
+    [change] = cp["changes"]
+    assert cp["time"] == int(frame["timestamp"][40].timestamp())
+    assert cp["attributes"] == {"bundle": "4.18.0"}
+    assert change["direction"] == direction
+    assert change["mean_after"] > change["mean_before"]
+    assert changepoint.is_regression(change) is regression
+    text = changepoint.format_regressions([cp])
+    assert ("time-start" in text) is regression
+    assert (text == "No regressions found!") is not regression
+
+
+def test_metric_threshold_from_config():
+    rng = np.random.default_rng(4)
+    frame = _frame(np.r_[rng.normal(100, 1, 40), rng.normal(105, 1, 40)])
+    config = {"time_column": "timestamp", "metrics": {"time-start": {"direction": -1, "threshold": 0.1}}}
+    assert changepoint.analyze_test(frame, config) == []
+    config["metrics"]["time-start"]["threshold"] = 0.02
+    assert len(changepoint.analyze_test(frame, config)) == 1
+
+
+def test_metric_list_defaults():
+    assert changepoint.metric_options(["time-start"]) == {"time-start": {"direction": 1, "threshold": 0.0}}
@@ -0,0 +1,134 @@
+import os
+import json
+import shutil
+import numpy as np
+import pandas as pd
+import pytest
+from src import manifest
+
+
+def _write(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def _write_earlier(path, text):
+    """A file left over from an earlier run, old enough whatever the mtime granularity."""
+    _write(path, text)
+    os.utime(path, (1, 1))
+
+
+def _generate(folder, artifacts):
+    """One run: every artifact is (name, inputs, content) and is only written when its inputs changed."""
+    written = []
+    for name, inputs, content in artifacts:
+        path = os.path.join(folder, name)
+        key = manifest.inputs_hash(inputs)
+        if not manifest.unchanged(path, key):
+            _write(path, content)
+            manifest.record(path, key)
+            written.append(name)
+    return written
+
+
+@pytest.fixture
+def folders(tmp_path):
+    return str(tmp_path / "result"), str(tmp_path / "bucket"), str(tmp_path / "previous-manifest.json")
+
+
+def _pipeline_run(folders, artifacts, extra=()):
+    """A run as in the pipeline: fresh result folder, manifest fetched from the bucket, delta uploaded."""
+    result, bucket, previous = folders
+    if os.path.exists(previous):
+        os.remove(previous)
+    os.makedirs(result)
+    os.makedirs(bucket, exist_ok=True)
+    manifest.load(result, previous if manifest.fetch(bucket, previous) else None)
+    written = _generate(result, artifacts)
+    for name, content in extra:
+        _write(os.path.join(result, name), content)
+    changed, skipped, removed = manifest.save()
+    uploaded = manifest.upload(result, bucket)
+    shutil.rmtree(result)
+    return written, changed, skipped, uploaded
+
+
+def test_unchanged_inputs_skip_generation_and_upload(folders):
+    artifacts = [("a.csv", "frame a", "a"), ("dataset/b.parquet", "frame b", "b")]
+    written, changed, skipped, _ = _pipeline_run(folders, artifacts, extra=[("regression.json", "[]")])
+    assert written == ["a.csv", "dataset/b.parquet"]
+    assert changed == ["a.csv", "dataset/b.parquet", "regression.json"]
+    assert skipped == 0
+
+    artifacts[1] = ("dataset/b.parquet", "frame b with a new run", "b2")
+    written, changed, skipped, uploaded = _pipeline_run(folders, artifacts, extra=[("regression.json", "[]")])
+    assert written == ["dataset/b.parquet"]
+    # regression.json is regenerated every run, but with the same content it is not uploaded again
+    assert changed == uploaded == ["dataset/b.parquet"]
+    assert skipped == 1
+
+    bucket = folders[1]
+    with open(os.path.join(bucket, "dataset/b.parquet"), encoding="utf-8") as f:
+        assert f.read() == "b2"
+    with open(os.path.join(bucket, manifest.MANIFEST_NAME), encoding="utf-8") as f:
+        artifacts_in_bucket = json.load(f)["artifacts"]
+    # skipped artifacts stay listed, so the next run can skip them again
+    assert sorted(artifacts_in_bucket) == ["a.csv", "dataset/b.parquet", "regression.json"]
+
+
+def test_same_inputs_with_new_content_is_uploaded(folders):
+    _pipeline_run(folders, [], extra=[("pipeline_metrics.json", "1")])
+    _, changed, _, _ = _pipeline_run(folders, [], extra=[("pipeline_metrics.json", "2")])
+    assert changed == ["pipeline_metrics.json"]
+
+
+def test_local_run_only_skips_files_still_on_disk(tmp_path):
+    folder = str(tmp_path)
+    artifacts = [("a.csv", "frame a", "a"), ("b.csv", "frame b", "b")]
+    manifest.load(folder, None)
+    _generate(folder, artifacts)
+    manifest.save()
+
+    os.remove(os.path.join(folder, "b.csv"))
+    manifest.load(folder, None)
+    assert _generate(folder, artifacts) == ["b.csv"]
+    changed, skipped, removed = manifest.save()
+    assert (changed, skipped, removed) == ([], 1, 0)
+
+
+def test_save_removes_files_neither_written_nor_skipped(tmp_path):
+    folder = str(tmp_path)
+    _write_earlier(os.path.join(folder, "time_consume_linux-amd64.csv"), "stale")
+    _write_earlier(os.path.join(folder, "dataset/family=time/platform=linux-amd64/part-0.parquet"), "stale")
+    manifest.load(folder, None)
+    stale = os.path.join(folder, "time_consume_linux-amd64.csv")
+    assert manifest.discard_stale(stale)
+    assert not os.path.exists(stale)
+    _generate(folder, [("a.csv", "frame a", "a")])
+    _, _, removed = manifest.save()
+    assert removed == 1
+    assert sorted(os.listdir(folder)) == ["a.csv", manifest.MANIFEST_NAME, manifest.UPLOAD_LIST_NAME]
+
+
+def test_discard_stale_keeps_recorded_and_skipped_files(tmp_path):
+    folder = str(tmp_path)
+    manifest.load(folder, None)
+    _generate(folder, [("a.csv", "frame a", "a")])
+    manifest.save()
+    manifest.load(folder, None)
+    _generate(folder, [("a.csv", "frame a", "a")])
+    assert not manifest.discard_stale(os.path.join(folder, "a.csv"))
+    assert os.path.exists(os.path.join(folder, "a.csv"))
+
+
+def test_inputs_hash():
+    frame = pd.DataFrame({"bundle": ["4.18.0", "4.19.0"], "time-start": [300.0, 310.0]})
+    assert manifest.inputs_hash("time", frame) == manifest.inputs_hash("time", frame.copy())
+    assert manifest.inputs_hash("time", frame) != manifest.inputs_hash("memory", frame)
+    changed = frame.assign(**{"time-start": [300.0, 311.0]})
+    assert manifest.inputs_hash("time", frame) != manifest.inputs_hash("time", changed)
+    renamed = frame.rename(columns={"time-start": "time-stop"})
+    assert manifest.inputs_hash("time", frame) != manifest.inputs_hash("time", renamed)
+    stamps = np.array(["2025-01-01", "2025-01-02"], dtype="datetime64[ns]")
+    assert manifest.inputs_hash(stamps) != manifest.inputs_hash(stamps[::-1])
@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src import ingest
+from src import pushdown
+from src import aggregate
+from src import synthetic
+
+METRICS = ingest.TIME_METRICS + ingest.MEMORY_METRICS
+
+
+@pytest.fixture(scope="module")
+def client():
+    hits = list(synthetic.generate_hits(300))
+    # older runs predate some metrics
+    for hit in hits[::7]:
+        del hit["_source"]["memory-deployment"]
+    return ingest.ReplayClient(hits)
+
+
+def _assert_matches(pushed, local):
+    assert list(pushed.columns) == list(local.columns)
+    assert [tuple(map(str, np.atleast_1d(key))) for key in pushed.index] == \
+        [tuple(map(str, np.atleast_1d(key))) for key in local.index]
+    # the local frames hold float32 values, the aggregations run on the indexed float64 ones
+    np.testing.assert_allclose(pushed.to_numpy(dtype=float), local.to_numpy(dtype=float), rtol=1e-5)
+
+
+def test_platform_summary_matches_pandas(client):
+    Platform_DATA = ingest.load_platform_data(client)
+    df = pd.concat(Platform_DATA.values(), ignore_index=True)
+    _assert_matches(pushdown.platform_summary(client, METRICS), aggregate.summarize(df, "category", METRICS))
+
+
+def test_bundle_summaries_match_pandas(client):
+    Platform_DATA = ingest.load_platform_data(client)
+    pushed = pushdown.bundle_summaries(client, METRICS)
+    assert sorted(pushed) == sorted(Platform_DATA)
+    for platform, frame in Platform_DATA.items():
+        _assert_matches(pushed[platform], aggregate.summarize(frame, "bundle", METRICS))
+
+
+def test_summary_buckets_page_through_every_key(client):
+    paged = list(pushdown.summary_buckets(client, ["category", "bundle"], METRICS, size=7))
+    whole = list(pushdown.summary_buckets(client, ["category", "bundle"], METRICS, size=1000))
+    assert len(paged) == len(whole) > 7
+    assert [b["key"] for b in paged] == [b["key"] for b in whole]
@@ -0,0 +1,36 @@
+import threading
+import pytest
+from src import scheduler
+from src.scheduler import Stage
+
+
+def _thread_name(*inputs):
+    return inputs + (threading.current_thread().name,)
+
+
+def test_serial_runs_every_stage_in_the_calling_thread():
+    stages = [
+        Stage("b", _thread_name, inputs=("a",), outputs=("b",), kind="process"),
+        Stage("a", _thread_name, outputs=("a",)),
+        Stage("c", _thread_name, inputs=("a", "b"), outputs=("c",)),
+    ]
+    results = scheduler.run(stages, serial=True)
+    caller = threading.current_thread().name
+    assert results["a"] == (caller,)
+    assert results["b"] == ((caller,), caller)
+    assert results["c"][-1] == caller
+    assert [s.name for s in sorted(stages, key=lambda s: s.started)] == ["a", "b", "c"]
+
+
+def _fail():
+    raise ValueError("boom")
+
+
+def test_serial_failure_skips_dependents():
+    stages = [
+        Stage("a", _fail, outputs=("a",)),
+        Stage("b", _thread_name, inputs=("a",), outputs=("b",)),
+    ]
+    with pytest.raises(scheduler.StageError, match="stage a failed: boom"):
+        scheduler.run(stages, serial=True)
+    assert stages[1].started is None
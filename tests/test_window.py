@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src import aggregate
+from src import window
+
+METRICS = ["time-start", "memory-start"]
+
+
+def _frame(rows=120, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "timestamp": pd.date_range("2025-01-01", periods=rows, freq="D"),
+        "bundle": pd.Categorical(np.where(np.arange(rows) < rows // 2, "4.18.0", "4.19.0")),
+        "time-start": rng.normal(300, 20, rows),
+        "memory-start": rng.normal(10000, 500, rows),
+    })
+
+
+def _rollup_and_window(frame, start):
+    expired = frame["timestamp"] < start
+    return aggregate.summarize(frame[~expired], "bundle", METRICS), window.rollup(frame[expired], METRICS)
+
+
+def test_combine_matches_summary_of_all_rows():
+    frame = _frame()
+    # the first bundle straddles the window start, the second lies inside it
+    summary, rollup = _rollup_and_window(frame, pd.Timestamp("2025-02-01"))
+    combined = window.combine(summary, rollup, METRICS)
+    full = aggregate.summarize(frame, "bundle", METRICS).set_axis(["4.18.0", "4.19.0"])
+    for metric in METRICS:
+        for stat in ("count", "mean", "std"):
+            np.testing.assert_allclose(combined[(metric, stat)], full[(metric, stat)], rtol=1e-9)
+        # order statistics cannot be merged from totals
+        assert np.isnan(combined.at["4.18.0", (metric, "median")])
+        assert np.isnan(combined.at["4.18.0", (metric, "p95")])
+        assert combined.at["4.19.0", (metric, "median")] == full.at["4.19.0", (metric, "median")]
+
+
+def test_combine_keeps_keys_only_in_rollups():
+    frame = _frame()
+    summary, rollup = _rollup_and_window(frame, pd.Timestamp("2025-03-15"))
+    assert list(summary.index) == ["4.19.0"]
+    combined = window.combine(summary, rollup, METRICS)
+    full = aggregate.summarize(frame, "bundle", METRICS).set_axis(["4.18.0", "4.19.0"])
+    assert list(combined.index) == ["4.18.0", "4.19.0"]
+    np.testing.assert_allclose(combined[("time-start", "mean")], full[("time-start", "mean")], rtol=1e-9)
+    assert combined.at["4.18.0", ("time-start", "count")] == 60
+
+
+def test_combine_without_window_rows():
+    frame = _frame()
+    combined = window.combine(None, window.rollup(frame, METRICS), METRICS)
+    full = aggregate.summarize(frame, "bundle", METRICS)
+    np.testing.assert_allclose(combined[("memory-start", "std")], full[("memory-start", "std")], rtol=1e-9)
+    assert combined[("memory-start", "median")].isna().all()
+
+
+def test_merge_rollups_adds_totals():
+    frame = _frame()
+    first, second = frame.iloc[:30], frame.iloc[30:90]
+    merged = window.merge_rollups(window.rollup(first, METRICS), window.rollup(second, METRICS))
+    pd.testing.assert_frame_equal(merged, window.rollup(frame.iloc[:90], METRICS), check_dtype=False)
+    assert window.merge_rollups(None, merged) is merged
+
+
+def test_apply_window_drops_platforms_without_rows(monkeypatch):
+    monkeypatch.setattr(window, "WINDOW_DAYS", 30)
+    frame = _frame()
+    now = frame["timestamp"].max() + pd.Timedelta(days=1)
+    kept, rollups, expired = window.apply_window(
+        {"linux-amd64": frame, "darwin-arm64": frame.iloc[:10]}, {}, METRICS, now=now)
+    assert list(kept) == ["linux-amd64"]
+    assert len(kept["linux-amd64"]) == 30
+    assert expired == 90 + 10
+    assert rollups["darwin-arm64"]["time-start.count"].sum() == 10
+
+
+@pytest.mark.parametrize("last_seen, rollups, expected", [
+    # an empty cache without rollups fetches the whole history once
+    ({}, {}, {}),
+    ({}, {"linux-amd64": "rollup"}, {"linux-amd64": "2025-03-02T00:00:00"}),
+    ({"linux-amd64": "2025-01-15T00:00:00"}, {}, {"linux-amd64": "2025-03-02T00:00:00"}),
+    ({"linux-amd64": "2025-03-20T00:00:00"}, {}, {"linux-amd64": "2025-03-20T00:00:00"}),
+    # every platform keeps its own bound; one never seen is fetched in full
+    ({"linux-amd64": "2025-03-20T00:00:00", "darwin-arm64": "2025-03-10T00:00:00"}, {"windows-amd64": "rollup"},
+     {"linux-amd64": "2025-03-20T00:00:00", "darwin-arm64": "2025-03-10T00:00:00",
+      "windows-amd64": "2025-03-02T00:00:00"}),
+])
+def test_query_since(monkeypatch, last_seen, rollups, expected):
+    monkeypatch.setattr(window, "WINDOW_DAYS", 30)
+    assert window.query_since(last_seen, rollups, now=pd.Timestamp("2025-04-01")) == expected
+
+
+def test_query_since_without_window():
+    last_seen = {"linux-amd64": "2025-01-15T00:00:00"}
+    assert window.query_since(last_seen, {"windows-amd64": "rollup"}) == last_seen